@@ -1,5 +1,10 @@
 # -*- coding: utf-8 -*-
-import os, sys, re, json, tempfile, hashlib, subprocess, urllib.request, webbrowser, ctypes
+import os, sys, re, json, tempfile, hashlib, subprocess, urllib.request, webbrowser, ctypes, shutil
+import itertools, argparse, queue, sqlite3, threading, time, socket, urllib.error, signal, atexit, hmac
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import lru_cache
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from pathlib import Path
 
 from PySide6 import QtCore, QtGui, QtWidgets
@@ -31,48 +36,313 @@ TASKBAR_LINK_URL = "https://osmantemiz.com/storage/favicons/BdfMJu9ZObo7vv8qwrM1
 
 PREVIEW_SECONDS_DEFAULT = 15
 
+# ---- Video yeniden kodlama (tüm parçalarda aynı ayar) ----
+VIDEO_ENCODE_ARGS  = ["-c:v","libx264","-preset","medium","-crf","20","-pix_fmt","yuv420p"]
+CHUNK_MIN_SECONDS  = 20     # parça hedef uzunluğu alt sınırı; daha kısa videolar tek geçişte kodlanır
+
+# ---- Auto-Tune ----
+AUTOTUNE_EXCERPT_SECONDS = 12
+AUTOTUNE_TOP_N           = 3
+AUTOTUNE_MAX_TP          = -1.0     # dBTP tavanı
+AUTOTUNE_TILT_REF        = -18.0    # hedef eğim (4k+ bant − 400Hz altı bant, dB)
+AUTOTUNE_WEIGHTS = {"loudness":2.0, "true_peak":4.0, "noise":0.5, "tilt":0.15, "clip":10.0}
+
+# ------------------ Süreç denetleyicisi ------------------
+SUPERVISOR_LOG  = str(Path(tempfile.gettempdir())/"nxa_supervisor.log")
+TERMINATE_GRACE = 3.0      # terminate → kill yükseltmesinden önce beklenen süre (sn)
+
+class ProcessCancelled(Exception):
+    pass
+
+class CancelToken:
+    """İşbirlikçi iptal: denetleyici, bu jetona bağlı tüm süreçleri sonlandırır."""
+    def __init__(self): self._ev=threading.Event()
+    def cancel(self): self._ev.set()
+    @property
+    def cancelled(self)->bool: return self._ev.is_set()
+
+class _PROCESS_MEMORY_COUNTERS(ctypes.Structure):
+    _fields_=[("cb",ctypes.c_ulong), ("PageFaultCount",ctypes.c_ulong),
+              ("PeakWorkingSetSize",ctypes.c_size_t), ("WorkingSetSize",ctypes.c_size_t),
+              ("QuotaPeakPagedPoolUsage",ctypes.c_size_t), ("QuotaPagedPoolUsage",ctypes.c_size_t),
+              ("QuotaPeakNonPagedPoolUsage",ctypes.c_size_t), ("QuotaNonPagedPoolUsage",ctypes.c_size_t),
+              ("PagefileUsage",ctypes.c_size_t), ("PeakPagefileUsage",ctypes.c_size_t)]
+
+@lru_cache(maxsize=None)
+def _win_procapi():
+    k32=ctypes.windll.kernel32; ft=ctypes.POINTER(ctypes.c_ulonglong)
+    k32.GetProcessTimes.argtypes=[ctypes.c_void_p, ft, ft, ft, ft]
+    k32.K32GetProcessMemoryInfo.argtypes=[ctypes.c_void_p, ctypes.POINTER(_PROCESS_MEMORY_COUNTERS), ctypes.c_ulong]
+    return k32
+
+def process_peak_rss_mb(proc)->float|None:
+    """Çocuğun kendi tepe belleği: Linux'ta /proc VmHWM, Windows'ta PeakWorkingSetSize; yoksa None."""
+    try:
+        if sys.platform.startswith("win"):
+            c=_PROCESS_MEMORY_COUNTERS(); c.cb=ctypes.sizeof(c)
+            if _win_procapi().K32GetProcessMemoryInfo(int(proc._handle), ctypes.byref(c), c.cb):
+                return c.PeakWorkingSetSize/(1024*1024)
+        elif os.path.isdir("/proc"):
+            with open(f"/proc/{proc.pid}/status","r",encoding="ascii",errors="ignore") as f:
+                for ln in f:
+                    if ln.startswith("VmHWM:"): return int(ln.split()[1])/1024
+    except (OSError, ValueError, AttributeError):
+        pass
+    return None
+
+def process_cpu_seconds_win(proc)->float|None:
+    """Windows: GetProcessTimes ile çekirdek+kullanıcı süresi (tanıtıcı kapanmadan önce çağrılmalı)."""
+    ct,et,kt,ut=(ctypes.c_ulonglong() for _ in range(4))
+    try:
+        if _win_procapi().GetProcessTimes(int(proc._handle), ctypes.byref(ct), ctypes.byref(et), ctypes.byref(kt), ctypes.byref(ut)):
+            return (kt.value+ut.value)/1e7           # 100 ns birimleri
+    except (OSError, AttributeError):
+        pass
+    return None
+
+class SupervisedProcess:
+    def __init__(self, proc, cmd:list, token, deadline, threads:int, light:bool):
+        self.proc=proc; self.cmd=cmd; self.token=token; self.deadline=deadline
+        self.threads=threads; self.light=light; self.start=time.time()
+        self.returncode=None; self.term_at=None; self.killed=False
+        self.cancelled=False; self.timed_out=False
+        self.wall=None; self.cpu=None; self.peak_rss_mb=None
+
+class ProcessSupervisor:
+    """Tüm ffmpeg/ffprobe çağrılarının tek sahibi: süreç grupları, iptal jetonları, terminate→kill,
+    eşzamanlı süreç ve CPU iş parçacığı bütçesi, süreç başına süre/CPU/tepe RSS muhasebesi."""
+    def __init__(self, max_procs:int|None=None, cpu_threads:int|None=None, grace:float=TERMINATE_GRACE):
+        self._cond=threading.Condition(); self._active={}; self._watchdog=None
+        self._queue=[]; self._tickets=itertools.count()      # FIFO giriş sırası (etkileşimli olanlar önde)
+        self.grace=grace; self.configure(max_procs, cpu_threads)
+        self.launched=self.ok=self.failed=self.cancelled=self.timeouts=self.killed=0
+        self.cpu_total=0.0; self.wall_total=0.0; self.peak_rss_mb=0.0
+
+    def configure(self, max_procs:int|None=None, cpu_threads:int|None=None):
+        cpu=os.cpu_count() or 2
+        with self._cond:
+            self.max_procs=max(1, max_procs or cpu)
+            self.cpu_threads=max(2, cpu_threads or cpu)
+            self.auto_threads=max(1, self.cpu_threads//2)   # "-threads 0"/belirtilmemiş bu değere indirilir
+            self._cond.notify_all()
+
+    def _weight(self, cmd:list)->tuple:
+        """İş parçacığı sayısını bütçeye bağlar: çıkış tarafı -threads (kodlayıcı) ve -filter_threads
+        yoksa eklenir, 0/otomatik değerler auto_threads'e, fazlası cpu_threads'e indirilir; ağırlık en büyük değerdir."""
+        last_in=max((i for i,a in enumerate(cmd) if a=="-i"), default=-1)
+        vals=[]
+        for i,a in enumerate(cmd[:-1]):
+            if a in ("-threads","-filter_threads","-filter_complex_threads"):
+                try: n=int(cmd[i+1])
+                except ValueError: n=0
+                n=self.auto_threads if n<=0 else min(n, self.cpu_threads)
+                cmd[i+1]=str(n); vals.append(n)
+        if last_in>=0:
+            n=max(vals, default=self.auto_threads)
+            if not any(a=="-threads" for a in cmd[last_in+2:-1]): cmd[-1:-1]=["-threads",str(n)]
+            if not any(a in ("-filter_threads","-filter_complex_threads") for a in cmd):
+                cmd[1:1]=["-filter_threads",str(n)]
+            vals.append(n)
+        return cmd, max(vals, default=1)
+
+    @staticmethod
+    def _is_light(cmd:list)->bool:
+        return Path(cmd[0]).stem.lower()=="ffprobe" or "-version" in cmd or "-filters" in cmd
+
+    def _busy(self):
+        heavy=[s for s in self._active.values() if not s.light]
+        return len(heavy), sum(s.threads for s in heavy)
+
+    def popen(self, cmd:list, token:CancelToken|None=None, timeout:float|None=None, light:bool|None=None,
+              interactive:bool=False, **kw)->SupervisedProcess:
+        cmd=list(cmd); light=self._is_light(cmd) if light is None else light
+        cmd,threads=(cmd,1) if light else self._weight(cmd)
+        with self._cond:
+            if not light:
+                # bilet sırası: önce etkileşimli (önizleme), sonra geliş sırası; sıradaki sığana dek diğerleri bekler
+                ticket=(0 if interactive else 1, next(self._tickets)); self._queue.append(ticket)
+                try:
+                    while True:
+                        n,used=self._busy()
+                        if ticket==min(self._queue) and n<self.max_procs and used+threads<=self.cpu_threads: break
+                        if token and token.cancelled: raise ProcessCancelled(" ".join(cmd[:3]))
+                        self._cond.wait(0.1)
+                finally:
+                    self._queue.remove(ticket); self._cond.notify_all()
+            if token and token.cancelled: raise ProcessCancelled(" ".join(cmd[:3]))
+            if sys.platform.startswith("win"):
+                kw["creationflags"]=kw.get("creationflags",0)|subprocess.CREATE_NEW_PROCESS_GROUP
+            else:
+                kw["start_new_session"]=True          # kendi süreç grubu → killpg ile çocuklarıyla birlikte
+            proc=subprocess.Popen(cmd, **kw)
+            sp=SupervisedProcess(proc, cmd, token, time.time()+timeout if timeout else None, threads, light)
+            self._active[proc.pid]=sp; self.launched+=1
+            if self._watchdog is None or not self._watchdog.is_alive():
+                self._watchdog=threading.Thread(target=self._watch, daemon=True, name="nxa-supervisor")
+                self._watchdog.start()
+        return sp
+
+    def _signal(self, sp:SupervisedProcess, hard:bool):
+        if sp.returncode is not None or sp.proc.returncode is not None: return
+        try:
+            if sys.platform.startswith("win"):
+                if hard: subprocess.run(["taskkill","/F","/T","/PID",str(sp.proc.pid)],
+                                        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+                else: sp.proc.send_signal(signal.CTRL_BREAK_EVENT)
+            else:
+                os.killpg(sp.proc.pid, signal.SIGKILL if hard else signal.SIGTERM)
+        except (ProcessLookupError, PermissionError, OSError):
+            pass
+
+    def _watch(self):
+        while True:
+            time.sleep(0.1)
+            with self._cond: procs=list(self._active.values())
+            now=time.time()
+            for sp in procs:
+                if sp.proc.returncode is None:
+                    rss=process_peak_rss_mb(sp.proc)
+                    if rss is not None: sp.peak_rss_mb=max(sp.peak_rss_mb or 0.0, rss)
+                if sp.term_at is None:
+                    if sp.token and sp.token.cancelled: sp.cancelled=True
+                    elif sp.deadline and now>sp.deadline: sp.timed_out=True
+                    else: continue
+                    sp.term_at=now; self._signal(sp, hard=False)
+                elif not sp.killed and now-sp.term_at>self.grace:
+                    sp.killed=True; self._signal(sp, hard=True)
+
+    def terminate(self, sp:SupervisedProcess):
+        if sp.term_at is None: sp.cancelled=True; sp.term_at=time.time(); self._signal(sp, hard=False)
+
+    def wait(self, sp:SupervisedProcess)->int:
+        """Süreci biçer (POSIX'te wait4, Windows'ta GetProcessTimes ile CPU ölçerek), bütçeyi serbest bırakır,
+        istatistik yazar. Tepe bellek gözcünün çocuktan aldığı örneklerdir (ru_maxrss ebeveynin çatal öncesi RSS'ini taşır)."""
+        if sp.returncode is not None: return sp.returncode
+        rss=process_peak_rss_mb(sp.proc)
+        if rss is not None: sp.peak_rss_mb=max(sp.peak_rss_mb or 0.0, rss)
+        if hasattr(os,"wait4"):
+            try:
+                _,status,ru=os.wait4(sp.proc.pid, 0)
+                sp.proc.returncode=os.waitstatus_to_exitcode(status); sp.cpu=ru.ru_utime+ru.ru_stime
+            except ChildProcessError:
+                sp.proc.wait()
+        else:
+            sp.proc.wait()
+            if sys.platform.startswith("win"):
+                sp.cpu=process_cpu_seconds_win(sp.proc)
+                rss=process_peak_rss_mb(sp.proc)
+                if rss is not None: sp.peak_rss_mb=max(sp.peak_rss_mb or 0.0, rss)
+        sp.returncode=sp.proc.returncode; sp.wall=time.time()-sp.start
+        with self._cond:
+            self._active.pop(sp.proc.pid, None)
+            if sp.timed_out: self.timeouts+=1
+            elif sp.cancelled: self.cancelled+=1
+            elif sp.returncode==0: self.ok+=1
+            else: self.failed+=1
+            if sp.killed: self.killed+=1
+            self.wall_total+=sp.wall; self.cpu_total+=sp.cpu or 0.0
+            self.peak_rss_mb=max(self.peak_rss_mb, sp.peak_rss_mb or 0.0)
+            self._cond.notify_all()
+        self._log(sp)
+        return sp.returncode
+
+    def _log(self, sp:SupervisedProcess):
+        state="timeout" if sp.timed_out else "iptal" if sp.cancelled else f"rc={sp.returncode}"
+        cpu=f"{sp.cpu:.2f}s" if sp.cpu is not None else "-"; rss=f"{sp.peak_rss_mb:.0f}MB" if sp.peak_rss_mb is not None else "-"
+        try:
+            with open(SUPERVISOR_LOG,"a",encoding="utf-8",errors="ignore") as f:
+                f.write(f"{time.strftime('%Y-%m-%d %H:%M:%S')} pid={sp.proc.pid} {state}{' (kill)' if sp.killed else ''} "
+                        f"wall={sp.wall:.2f}s cpu={cpu} rss={rss} threads={sp.threads} :: {' '.join(sp.cmd)[:300]}\n")
+        except OSError:
+            pass
+
+    def run(self, cmd:list, timeout:float|None=None, token:CancelToken|None=None, stderr=subprocess.STDOUT, light:bool|None=None,
+            interactive:bool=False):
+        """Çalıştırır ve çıktıyı toplar; (SupervisedProcess, çıktı) döner."""
+        sp=self.popen(cmd, token=token, timeout=timeout, light=light, interactive=interactive,
+                      stdout=subprocess.PIPE, stderr=stderr, text=True, encoding="utf-8", errors="ignore")
+        try: out=sp.proc.stdout.read()
+        except BaseException: self.terminate(sp); raise
+        finally: self.wait(sp)
+        return sp, out
+
+    def cancel_all(self):
+        with self._cond: procs=list(self._active.values())
+        for sp in procs: self.terminate(sp)
+
+    def shutdown(self, timeout:float=TERMINATE_GRACE+2):
+        """Çıkışta öksüz süreç bırakmamak için hepsini sonlandırır (gerekirse kill)."""
+        self.cancel_all(); end=time.time()+timeout
+        while time.time()<end:
+            with self._cond:
+                if not self._active: return
+            time.sleep(0.1)
+        with self._cond: procs=list(self._active.values())
+        for sp in procs: self._signal(sp, hard=True)
+
+    def snapshot(self)->dict:
+        with self._cond:
+            n,used=self._busy(); now=time.time()
+            return {"active":len(self._active), "heavy":n, "waiting":len(self._queue), "max_procs":self.max_procs,
+                    "threads_used":used, "cpu_threads":self.cpu_threads,
+                    "launched":self.launched, "ok":self.ok, "failed":self.failed, "cancelled":self.cancelled,
+                    "timeouts":self.timeouts, "killed":self.killed,
+                    "cpu_s":round(self.cpu_total,2), "wall_s":round(self.wall_total,2), "peak_rss_mb":round(self.peak_rss_mb,1),
+                    "running":[{"pid":pid, "cmd":Path(s.cmd[0]).stem, "elapsed":round(now-s.start,1), "threads":s.threads}
+                               for pid,s in self._active.items()]}
+
+SUPERVISOR = ProcessSupervisor()
+atexit.register(SUPERVISOR.shutdown)
+
 # ------------------ FFmpeg yardımcıları ------------------
 def ff_ok():
     try:
-        subprocess.run(["ffmpeg","-version"], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=True)
-        subprocess.run(["ffprobe","-version"], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=True)
-        return True
+        return all(SUPERVISOR.run([tool,"-version"], timeout=15)[0].returncode==0 for tool in ("ffmpeg","ffprobe"))
     except Exception:
         return False
 
+@lru_cache(maxsize=None)
 def has_filter(name:str)->bool:
     try:
-        out=subprocess.run(["ffmpeg","-hide_banner","-filters"], stdout=subprocess.PIPE,
-                           stderr=subprocess.STDOUT, text=True, encoding="utf-8", errors="ignore", check=True).stdout
+        sp,out=SUPERVISOR.run(["ffmpeg","-hide_banner","-filters"], timeout=15)
+        if sp.returncode!=0: return False
         return f" {name} " in out or f" {name}\n" in out
     except Exception:
         return False
 
+def ff_filter_value(v:str)->str:
+    """Filtre seçenek değerini iki seviyede kaçışlar (seçenek: \\ ' : — grafik: \\ ' , ; [ ])."""
+    v=re.sub(r"([\\':])", r"\\\1", str(v))
+    return re.sub(r"([\\',;\[\]])", r"\\\1", v)
+
+def arnndn_filter(model:str|None)->str:
+    return f"arnndn=m={ff_filter_value(model)}" if model else "arnndn=m=rnnoise"
+
+@lru_cache(maxsize=None)
 def arnndn_available(model:str|None)->bool:
     if not has_filter("arnndn"): return False
-    test = f"anullsrc=r=48000,arnndn=m={model}" if model else "anullsrc=r=48000,arnndn=m=rnnoise"
+    if model and not os.path.isfile(model): return False
+    test = "anullsrc=r=48000,"+arnndn_filter(model)
     try:
-        p = subprocess.run(["ffmpeg","-hide_banner","-f","lavfi","-i",test,"-t","0.05","-f","null","-"],
-                           stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True)
-        return p.returncode==0
+        sp,_ = SUPERVISOR.run(["ffmpeg","-hide_banner","-f","lavfi","-i",test,"-t","0.05","-f","null","-"],
+                              timeout=15, light=True)
+        return sp.returncode==0
     except Exception:
         return False
 
 def has_stream(path:str, kind:str)->bool:
     try:
-        out=subprocess.run(["ffprobe","-v","error","-select_streams",f"{kind}:0",
-                            "-show_entries","stream=codec_type","-of","csv=p=0", path],
-                           stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True).stdout.strip()
-        return out!=""
+        _,out=SUPERVISOR.run(["ffprobe","-v","error","-select_streams",f"{kind}:0",
+                              "-show_entries","stream=codec_type","-of","csv=p=0", path], timeout=30)
+        return out.strip()!=""
     except Exception:
         return True
 
 def media_duration(path:str)->float:
     try:
-        out=subprocess.run(["ffprobe","-v","error","-show_entries","format=duration",
-                            "-of","default=noprint_wrappers=1:nokey=1", path],
-                           stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True).stdout.strip()
-        return float(out)
+        _,out=SUPERVISOR.run(["ffprobe","-v","error","-show_entries","format=duration",
+                              "-of","default=noprint_wrappers=1:nokey=1", path], timeout=30, stderr=subprocess.DEVNULL)
+        return float(out.strip())
     except Exception:
         return 0.0
 
@@ -82,20 +352,135 @@ def suggest_output_path(inp: str) -> str:
     if ext not in [".mp4",".mov",".mkv",".m4v"]: ext=".mp4"
     return str(p.with_name(p.stem + "_cleaned" + ext))
 
-def run_capture(cmd:list, timeout:int=30):
+def video_filters(video:dict|None)->list:
+    video=video or {}; vf=[]
+    if video.get("scale",0)>0: vf.append(f"scale={int(video['scale'])}:-2")
+    if video.get("fps",0)>0: vf.append(f"fps={int(video['fps'])}")
+    return vf
+
+def video_needs_encode(video:dict|None)->bool:
+    """Ölçek/FPS istenmişse 'kopyala' işaretli olsa bile yeniden kodlama gerekir."""
+    return bool(video) and (not video.get("copy",True) or bool(video_filters(video)))
+
+def video_encode_args(video:dict|None)->list:
+    if not video_needs_encode(video): return ["-c:v:0","copy"]
+    vf=video_filters(video)
+    return (["-filter:v:0",",".join(vf)] if vf else [])+VIDEO_ENCODE_ARGS
+
+def build_export_cmd(ip:str, op:str, af:str, video:dict|None=None)->list:
+    base=["ffmpeg","-y","-i",ip]
+    if has_stream(ip,"a"): base+=["-map","0:a:0?","-filter:a:0",af,"-c:a:0","aac","-b:a:0","256k"]
+    base+=["-map","0:v:0?"]+video_encode_args(video)
+    base+=["-movflags","+faststart","-threads","0",op]     # çıkış tarafı: denetleyici bütçeye indirir
+    return base
+
+def media_start_times(path:str)->dict:
+    """Kapsayıcı ve ilk görüntü/ses akışlarının start_time değerleri (yoksa 0)."""
+    ok,out=run_capture(["ffprobe","-v","error","-show_entries","format=start_time:stream=codec_type,start_time",
+                        "-of","json", path], 60)
+    try: info=json.loads(out) if ok else {}
+    except ValueError: info={}
+    def num(v):
+        try: return float(v)
+        except (TypeError, ValueError): return 0.0
+    res={"format":num(info.get("format",{}).get("start_time")), "v":0.0, "a":0.0}
+    for st in reversed(info.get("streams",[])):           # her türün ilk akışı kalsın
+        k={"video":"v","audio":"a"}.get(st.get("codec_type"))
+        if k: res[k]=num(st.get("start_time"))
+    return res
+
+def keyframe_times(path:str, start:float=0.0)->list:
+    """Video akışındaki anahtar kare zamanları (paket bayraklarından; çözme yapılmaz).
+    pts mutlaktır, girdi -ss ise kapsayıcı start_time'a görelidir; bu yüzden start çıkarılır."""
+    ok,out=run_capture(["ffprobe","-v","error","-select_streams","v:0","-show_entries","packet=pts_time,flags",
+                        "-of","csv=p=0", path], 300)
+    if not ok: return []
+    ts=[]
+    for ln in out.splitlines():
+        p=ln.strip().split(",")
+        if len(p)>=2 and "K" in p[1]:
+            try: ts.append(float(p[0])-start)
+            except ValueError: pass
+    return sorted(set(ts))
+
+def plan_chunks(keyframes:list, total:float, jobs:int)->list:
+    """Anahtar karelerden bölme noktaları seçer: her çekirdeğe ~2 parça, en az CHUNK_MIN_SECONDS."""
+    target=max(CHUNK_MIN_SECONDS, total/max(1,jobs*2))
+    cuts=[0.0]
+    for t in keyframes:
+        if t-cuts[-1]>=target and total-t>=CHUNK_MIN_SECONDS/2: cuts.append(t)
+    return [(a, (cuts[i+1] if i+1<len(cuts) else total)) for i,a in enumerate(cuts)]
+
+def run_capture(cmd:list, timeout:int=30, token:CancelToken|None=None, interactive:bool=False):
     try:
-        p=subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True, universal_newlines=True)
-        out=p.communicate(timeout=timeout)[0]
-        return (p.returncode==0, out)
-    except subprocess.TimeoutExpired:
-        try:
-            p.terminate()
-            try: p.wait(timeout=2)
-            except subprocess.TimeoutExpired: p.kill()
-        except Exception: pass
-        return (False, "[TIMEOUT]")
+        sp,out=SUPERVISOR.run(cmd, timeout=timeout, token=token, interactive=interactive)
+    except ProcessCancelled:
+        return (False, "[CANCELLED]")
     except Exception as e:
         return (False, str(e))
+    if sp.timed_out: return (False, "[TIMEOUT]")
+    if sp.cancelled: return (False, "[CANCELLED]")
+    return (sp.returncode==0, out)
+
+def ffmpeg_stream(cmd:list, log_path:str, total_seconds:float, on_percent=None, token:CancelToken|None=None)->bool:
+    """ffmpeg'i denetleyici üzerinden çalıştırır, çıktıyı loga yazar, time= satırlarından yüzde bildirir."""
+    with open(log_path,"w",encoding="utf-8",errors="ignore") as lf:
+        lf.write(" ".join(cmd)+"\n\n")
+        try:
+            sp = SUPERVISOR.popen(cmd, token=token, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                                  text=True, encoding="utf-8", errors="ignore")
+        except ProcessCancelled:
+            lf.write("[CANCELLED]\n"); return False
+        try:
+            for line in sp.proc.stdout:
+                lf.write(line)
+                t=None
+                m=re.search(r"time=(\d+):(\d+):(\d+)\.(\d+)", line)
+                if m:
+                    t = int(m.group(1))*3600 + int(m.group(2))*60 + int(m.group(3)) + int(m.group(4))/100.0
+                else:
+                    m=re.search(r"time=(\d+)\.(\d+)", line)
+                    if m: t=float(f"{m.group(1)}.{m.group(2)}")
+                if t is not None and total_seconds>0 and on_percent:
+                    on_percent(int(clamp(100.0*t/total_seconds, 0, 100)))
+        except BaseException:
+            SUPERVISOR.terminate(sp); raise
+        finally:
+            SUPERVISOR.wait(sp)
+        ok = sp.returncode==0 and not sp.cancelled
+        if sp.cancelled: lf.write("\n[CANCELLED]\n")
+        return ok
+
+def inject_filter_before_output(cmd:list, af:str)->list:
+    if not af or any(a.startswith("-filter:a") or a=="-af" for a in cmd): return cmd
+    return cmd[:-1] + ["-filter:a:0", af] + [cmd[-1]]
+
+def simplify_filters_on_error(af:str, err:str)->str:
+    removes=[]
+    for key in ["arnndn","agate","asoftclip","alimiter","adeclip","equalizer","compand","dynaudnorm","loudnorm"]:
+        if f"filter '{key}'" in err or f"No such filter: '{key}'" in err: removes.append(key)
+    if not removes: return af
+    kept=[]
+    for p in re.split(r"(?<!\\),", af):
+        if any(p.strip().startswith(r+"=") or p.strip()==r for r in removes): continue
+        kept.append(p)
+    return ",".join(kept)
+
+def ff_try_with_rescue(base_cmd:list, af:str, timeout:int, token:CancelToken|None=None, on_status=None, interactive:bool=False):
+    """Zinciri dener; desteklenmeyen filtrede sadeleştirir, olmazsa yalnız highpass/lowpass(+limiter) ile dener."""
+    ok, out = run_capture(inject_filter_before_output(list(base_cmd), af), timeout, token, interactive)
+    if ok: return True, out, af
+    new_af = simplify_filters_on_error(af, out)
+    if new_af != af:
+        if on_status: on_status("Filtrelerin bir kısmı desteklenmiyor → sadeleştiriliyor…")
+        ok2, out2 = run_capture(inject_filter_before_output(list(base_cmd), new_af), timeout, token, interactive)
+        if ok2: return True, out2, new_af
+        basic=[p for p in af.split(",") if p.startswith("highpass") or p.startswith("lowpass")]
+        if has_filter("alimiter"): basic.append("alimiter=limit=0.93")
+        ok3, out3 = run_capture(inject_filter_before_output(list(base_cmd), ",".join(basic) if basic else ""), timeout, token, interactive)
+        if ok3: return True, out3, ",".join(basic)
+        return False, out3, ",".join(basic)
+    return False, out, af
 
 # ----------------- Windows AppUserModelID ----------------
 def set_windows_app_id(app_id: str = "NEXOAUDIO.QtStudioAI"):
@@ -109,44 +494,141 @@ def set_windows_app_id(app_id: str = "NEXOAUDIO.QtStudioAI"):
 class FFmpegStreamWorker(QtCore.QThread):
     percent = Signal(int); finished = Signal(bool, str)
     def __init__(self, cmd, log_path, total_seconds:float, parent=None):
-        super().__init__(parent); self.cmd=cmd; self.log_path=log_path; self.total=total_seconds; self._proc=None
+        super().__init__(parent); self.cmd=cmd; self.log_path=log_path; self.total=total_seconds; self.token=CancelToken()
     def run(self):
         try:
-            with open(self.log_path,"w",encoding="utf-8",errors="ignore") as lf:
-                lf.write(" ".join(self.cmd)+"\n\n")
-                self._proc = subprocess.Popen(self.cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
-                                              text=True, universal_newlines=True)
-                for line in self._proc.stdout:
-                    lf.write(line)
-                    t=None
-                    m=re.search(r"time=(\d+):(\d+):(\d+)\.(\d+)", line)
-                    if m:
-                        t = int(m.group(1))*3600 + int(m.group(2))*60 + int(m.group(3)) + int(m.group(4))/100.0
-                    else:
-                        m=re.search(r"time=(\d+)\.(\d+)", line)
-                        if m: t=float(f"{m.group(1)}.{m.group(2)}")
-                    if t is not None and self.total>0:
-                        pct=int(clamp(100.0*t/self.total, 0, 100))
-                        self.percent.emit(pct)
-                ret = self._proc.wait()
-            self.finished.emit(ret==0, self.log_path)
+            ok=ffmpeg_stream(self.cmd, self.log_path, self.total, self.percent.emit, self.token)
+            self.finished.emit(ok, self.log_path)
         except Exception:
             self.finished.emit(False, self.log_path)
-    def cancel(self):
+    def cancel(self): self.token.cancel()
+
+class PreviewClipWorker(QtCore.QThread):
+    """Filtreli önizleme klibini arayüz dışında üretir; denetleyicide öncelikli (etkileşimli) sıraya girer."""
+    status = Signal(str); finished = Signal(bool, str, str)
+    def __init__(self, cmd:list, af:str, out:str, timeout:int, parent=None):
+        super().__init__(parent); self.cmd=cmd; self.af=af; self.out=out; self.timeout=timeout; self.token=CancelToken()
+    def run(self):
         try:
-            if self._proc and self._proc.poll() is None: self._proc.terminate()
-        except Exception: pass
+            ok,log,_=ff_try_with_rescue(self.cmd, self.af, self.timeout, self.token, self.status.emit, interactive=True)
+            self.finished.emit(ok, self.out, log)
+        except Exception as e:
+            self.finished.emit(False, self.out, str(e))
+    def cancel(self): self.token.cancel()
+
+class ChunkedExportWorker(QtCore.QThread):
+    """Videoyu anahtar karelerden böler, parçaları çekirdeklere dağıtıp kodlar, kayıpsız birleştirir ve işlenmiş sesle muxlar."""
+    percent = Signal(int); finished = Signal(bool, str); chunk_done = Signal(int, int, float, float)
+    def __init__(self, ip:str, op:str, af:str, video:dict, log_path:str, total_seconds:float, jobs:int|None=None, parent=None):
+        super().__init__(parent)
+        self.ip=ip; self.op=op; self.af=af; self.video=video; self.log_path=log_path; self.total=total_seconds
+        self.jobs=max(1, jobs or min(SUPERVISOR.max_procs, SUPERVISOR.cpu_threads//2))
+        self.token=CancelToken(); self._lock=threading.Lock(); self._done_sec={}
+
+    def cancel(self): self.token.cancel()
+
+    def _on_chunk_percent(self, idx:int, seconds:float, pct:int):
+        with self._lock:
+            self._done_sec[idx]=seconds*pct/100.0; done=sum(self._done_sec.values())
+        self.percent.emit(int(clamp(95.0*done/self.total, 0, 95)))
+
+    def _log(self, lf, msg:str):
+        with self._lock: lf.write(msg+"\n"); lf.flush()
+
+    def _encode_chunk(self, lf, work:str, idx:int, n:int, a:float, b:float, threads:int):
+        out=os.path.join(work, f"chunk_{idx:04d}.mp4"); clog=os.path.join(work, f"chunk_{idx:04d}.log")
+        vf=video_filters(self.video)
+        cmd=["ffmpeg","-y","-hide_banner","-ss",f"{a:.6f}","-i",self.ip,"-t",f"{b-a:.6f}",
+             "-map","0:v:0","-an","-sn","-dn"]+(["-vf",",".join(vf)] if vf else [])
+        cmd+=VIDEO_ENCODE_ARGS+["-threads",str(threads),out]
+        t0=time.time()
+        ok=ffmpeg_stream(cmd, clog, b-a, lambda p: self._on_chunk_percent(idx, b-a, p), self.token)
+        wall=max(1e-3, time.time()-t0)
+        with open(clog,"r",encoding="utf-8",errors="ignore") as f: text=f.read()
+        if not ok:
+            if self.token.cancelled: return None      # iptal ya da kardeş parçanın hatası
+            self.token.cancel()                       # diğer parçalar boşuna kodlamasın
+            self._log(lf, f"[parça {idx+1}/{n}] HATA\n{text[-1600:]}"); return None
+        frames=re.findall(r"frame=\s*(\d+)", text)
+        fps=(int(frames[-1])/wall) if frames else 0.0; rt=(b-a)/wall
+        self._log(lf, f"[parça {idx+1}/{n}] {a:.2f}-{b:.2f} sn · {fps:.1f} fps · {rt:.2f}x gerçek zaman · {wall:.1f} sn")
+        self.chunk_done.emit(idx+1, n, fps, rt)
+        return out
+
+    def run(self):
+        try: self.finished.emit(self.process(), self.log_path)
+        except Exception as e:
+            try:
+                with open(self.log_path,"a",encoding="utf-8") as lf: lf.write(f"\n[HATA] {e}\n")
+            except Exception: pass
+            self.finished.emit(False, self.log_path)
+
+    def process(self)->bool:
+        work=tempfile.mkdtemp(prefix="nxa_chunks_")
+        try: return self._process(work)
+        finally: shutil.rmtree(work, ignore_errors=True)     # başarısız/iptal edilmiş dışa aktarımda da parçalar silinir
+
+    def _process(self, work:str)->bool:
+        with open(self.log_path,"w",encoding="utf-8",errors="ignore") as lf:
+            starts=media_start_times(self.ip)
+            segs=plan_chunks(keyframe_times(self.ip, starts["format"]), self.total, self.jobs)
+            has_audio=has_stream(self.ip,"a")
+            # denetleyici bütçesi: ses geçişine bir süreç ve bir iş parçacığı ayrılır, kalanı parçalara bölünür
+            jobs=max(1, min(self.jobs, len(segs), SUPERVISOR.max_procs-has_audio))
+            threads=max(1, (SUPERVISOR.cpu_threads-has_audio)//jobs)
+            self._log(lf, f"Çalışma klasörü: {work}")
+            self._log(lf, f"Parçalı kodlama: {len(segs)} parça, {jobs} eşzamanlı, parça başına {threads} iş parçacığı")
+            self._log(lf, "Ayarlar: "+" ".join(VIDEO_ENCODE_ARGS+(["-vf",",".join(video_filters(self.video))] if video_filters(self.video) else [])))
+            audio=None; t_all=time.time()
+            with ThreadPoolExecutor(max_workers=jobs+1) as ex:
+                if has_audio:
+                    audio=os.path.join(work,"audio.m4a")
+                    acmd=["ffmpeg","-y","-hide_banner","-filter_threads","1","-i",self.ip,"-map","0:a:0","-vn","-filter:a",self.af,
+                          "-c:a","aac","-b:a","256k","-threads","1",audio]
+                    afut=ex.submit(ffmpeg_stream, acmd, os.path.join(work,"audio.log"), 0, None, self.token)
+                futs=[ex.submit(self._encode_chunk, lf, work, i, len(segs), a, b, threads) for i,(a,b) in enumerate(segs)]
+                chunks=[f.result() for f in futs]
+                if audio and not afut.result():
+                    if self.token.cancelled: return False
+                    self.token.cancel()
+                    with open(os.path.join(work,"audio.log"),encoding="utf-8",errors="ignore") as f:
+                        self._log(lf, "[ses] HATA\n"+f.read()[-1600:])
+                    return False
+            if self.token.cancelled or any(c is None for c in chunks): return False
+
+            lst=os.path.join(work,"list.txt")
+            with open(lst,"w",encoding="utf-8") as f:
+                for c in chunks: f.write("file '"+c.replace("'", "'\\''")+"'\n")
+            video=os.path.join(work,"video.mp4")
+            ok,out=run_capture(["ffmpeg","-y","-hide_banner","-f","concat","-safe","0","-i",lst,"-c","copy",video], 600, self.token)
+            if not ok: self._log(lf, "[birleştirme] HATA\n"+out[-1600:]); return False
+            self.percent.emit(97)
+            # parçalar ve ses 0'dan başlar; kaynaktaki ses/görüntü başlangıç farkı geri verilir
+            d=(starts["a"]-starts["v"]) if audio else 0.0
+            mux=["ffmpeg","-y","-hide_banner"]+(["-itsoffset",f"{-d:.6f}"] if d<0 else [])+["-i",video]
+            mux+=((["-itsoffset",f"{d:.6f}"] if d>0 else [])+["-i",audio]) if audio else []
+            mux+=["-map","0:v:0"]+(["-map","1:a:0"] if audio else [])+["-c","copy","-movflags","+faststart",self.op]
+            ok,out=run_capture(mux, 600, self.token)
+            if not ok: self._log(lf, "[mux] HATA\n"+out[-1600:]); return False
+            wall=time.time()-t_all
+            self._log(lf, f"Toplam: {wall:.1f} sn · {self.total/max(1e-3,wall):.2f}x gerçek zaman")
+        self.percent.emit(100)
+        return True
 
 class AIStudioWorker(QtCore.QThread):
     done = Signal(bool, str, dict)
     progress = Signal(int, str)
     def __init__(self, input_path:str, target_lufs:float=-18.0,
                  rnn_model:str|None=None, leveler:bool=True,
-                 nr_aggr:bool=True, style:str="Natural", humanize:bool=True, enhance_beta:bool=False, parent=None):
+                 nr_aggr:bool=True, style:str="Natural", humanize:bool=True, enhance_beta:bool=False,
+                 use_rnn:bool=True, gate_offset:float=6.0, parent=None):
         super().__init__(parent)
         self.input_path=input_path; self.target_lufs=target_lufs
         self.rnn_model=rnn_model; self.leveler=leveler; self.nr_aggr=nr_aggr
         self.style=style; self.humanize=humanize; self.enhance_beta=enhance_beta
+        self.use_rnn=use_rnn; self.gate_offset=gate_offset; self.token=CancelToken()
+
+    def cancel(self): self.token.cancel()
 
     @staticmethod
     def _deess_eq(human:bool):
@@ -182,8 +664,8 @@ class AIStudioWorker(QtCore.QThread):
 
     def _noise_block(self, noise_floor_db:float, human:bool, strong:bool=False):
         model = self.rnn_model if self.rnn_model else None
-        if arnndn_available(model): 
-            return [f"arnndn=m={model}" if model else "arnndn=m=rnnoise"]
+        if self.use_rnn and arnndn_available(model):
+            return [arnndn_filter(model)]
         if has_filter("afftdn"):
             nr = 20 if strong else (18 if self.nr_aggr and not human else 9)
             nf = int(clamp(noise_floor_db - (10 if strong else (8 if self.nr_aggr and not human else 2)), -34, -16))
@@ -199,20 +681,22 @@ class AIStudioWorker(QtCore.QThread):
         except Exception as e:
             self.done.emit(False, str(e), {})
 
-    def process(self):
+    def analyze(self)->dict:
+        """astats + loudnorm ölçümü; zincir kurulumundan ayrı (Auto-Tune tek analizi paylaşır)."""
         ip = self.input_path
         SAMPLE_T = "35"
 
+        # yalnız ses ölçümü: tek iş parçacığı yeter, video boyutlu varsayılan bütçe ayrılmasın
         def astatslog():
-            return ["ffmpeg","-hide_banner","-t", SAMPLE_T, "-i", ip,
+            return ["ffmpeg","-hide_banner","-threads","1","-filter_threads","1","-t", SAMPLE_T, "-i", ip,
                     "-map","a:0","-vn","-analyzeduration","0","-probesize","2000000",
                     "-filter:a","astats=metadata=1:reset=1","-f","null","-"]
         def loudnormlog():
-            return ["ffmpeg","-hide_banner","-t", SAMPLE_T, "-i", ip,
+            return ["ffmpeg","-hide_banner","-threads","1","-filter_threads","1","-t", SAMPLE_T, "-i", ip,
                     "-map","a:0","-vn","-analyzeduration","0","-probesize","2000000",
                     "-filter:a", f"loudnorm=I={self.target_lufs}:TP=-1.0:LRA=11.0:print_format=json","-f","null","-"]
 
-        ok2,out2=run_capture(astatslog(),25); self.progress.emit(45,"astats")
+        ok2,out2=run_capture(astatslog(),25,self.token); self.progress.emit(45,"astats")
         rms_min=-60.0; rms_max=-18.0
         if ok2:
             for ln in out2.splitlines():
@@ -222,16 +706,19 @@ class AIStudioWorker(QtCore.QThread):
                         v=float(m.group(1)); rms_max=max(rms_max,v); rms_min=min(rms_min,v)
         noise_floor=rms_min
 
-        okm, meas = run_capture(loudnormlog(), 30); self.progress.emit(65,"loudnorm ölçüm")
+        okm, meas = run_capture(loudnormlog(), 30, self.token); self.progress.emit(65,"loudnorm ölçüm")
         measured=None
         if okm:
             m=re.search(r"\{\s*\"input_i\".*\}", meas, re.S)
             if m:
                 try: measured=json.loads(m.group(0))
                 except: measured=None
+        return {"noise_floor":noise_floor, "rms_max":rms_max, "measured":measured}
 
-        human=True
-        comp_thr = clamp(rms_max-4, -40, -8); gate_thr=clamp(noise_floor+6, -80, -20)
+    def build_chain(self, an:dict)->str:
+        noise_floor=an["noise_floor"]; rms_max=an["rms_max"]; measured=an["measured"]
+        human=self.humanize
+        comp_thr = clamp(rms_max-4, -40, -8); gate_thr=clamp(noise_floor+self.gate_offset, -80, -20)
 
         if self.enhance_beta:
             chain=[]
@@ -280,9 +767,719 @@ class AIStudioWorker(QtCore.QThread):
             if has_filter("asoftclip"): chain.append("asoftclip")
             if has_filter("alimiter"): chain.append("alimiter=limit=0.93")
 
-        studio_chain=",".join([c for c in chain if c])
+        return ",".join([c for c in chain if c])
+
+    def process(self):
+        an=self.analyze()
+        if self.token.cancelled: return False, "İptal edildi.", {}
+        studio_chain=self.build_chain(an)
         return True, ("Adobe Podcast (Beta)" if self.enhance_beta else "AI Studio hazır"), {"studio_chain": studio_chain}
 
+# --------------------- Auto-Tune -------------------------
+def autotune_excerpt(ip:str, seconds:int, out:str, token:CancelToken|None=None):
+    """Girdinin ortasına yakın temsili bir bölümü tek sefer 48k mono WAV'a çözer; (ok, log, başlangıç sn)."""
+    dur=media_duration(ip)
+    start=clamp(dur*0.3, 0.0, max(0.0, dur-seconds)) if dur>seconds else 0.0
+    cmd=["ffmpeg","-hide_banner","-y","-threads","1","-filter_threads","1","-ss",f"{start:.2f}","-t",str(seconds),"-i",ip,
+         "-map","0:a:0","-vn","-ac","1","-ar","48000","-c:a","pcm_s16le",out]
+    ok,log=run_capture(cmd, max(60, seconds*4), token)
+    return ok, log, start
+
+def autotune_candidates(rnn_ok:bool)->list:
+    """Denenecek AIStudioWorker parametre kombinasyonları (aynı zinciri üretenler sonradan elenir)."""
+    rnn_opts=(True,False) if rnn_ok else (False,)
+    cands=[]
+    for style,human,nr,rnn,gate in itertools.product(["Natural","Warm","Crisp","Radio"],(True,False),(True,False),rnn_opts,(4.0,8.0)):
+        cands.append(dict(style=style, humanize=human, nr_aggr=nr, use_rnn=rnn, gate_offset=gate, enhance_beta=False))
+    for human,rnn,gate in itertools.product((True,False),rnn_opts,(4.0,8.0)):
+        cands.append(dict(style="Natural", humanize=human, nr_aggr=True, use_rnn=rnn, gate_offset=gate, enhance_beta=True))
+    return cands
+
+def autotune_label(p:dict)->str:
+    parts=["Podcast (Beta)" if p.get("enhance_beta") else p.get("style","Natural")]
+    if p.get("humanize"): parts.append("Humanize")
+    elif p.get("nr_aggr"): parts.append("Agresif NR")
+    parts.append("RNNoise" if p.get("use_rnn") else "afftdn")
+    parts.append(f"gate +{p.get('gate_offset',6.0):g}dB")
+    return " · ".join(parts)
+
+def _autotune_parse(log:str)->dict:
+    m={}
+    v=re.findall(r"I:\s+(-?\d+(?:\.\d+)?) LUFS", log)
+    if v: m["I"]=float(v[-1])
+    v=re.findall(r"Peak:\s+(-?\d+(?:\.\d+)?|-inf) dBFS", log)
+    if v: m["tp"]=float(v[-1])
+    mom=[]
+    for t,val in re.findall(r"t:\s*([\d.]+)\s+TARGET:.*?M:\s*(-?\d+(?:\.\d+)?|-inf)", log):
+        if float(t)>=0.4: mom.append(max(-120.7, float(val)))   # ilk 400ms pencere dolmadan anlamsız
+    if mom:
+        mom.sort(); m["noise"]=mom[int(len(mom)*0.1)]         # en sessiz %10 → artık gürültü tabanı
+    vd={}
+    for name,key,val in re.findall(r"\[volumedetect@(\w+) @ [^\]]+\] (mean_volume|n_samples|histogram_0db): (-?\d+(?:\.\d+)?|-inf)", log):
+        vd[(name,key)]=float(val)
+    if ("hi","mean_volume") in vd and ("lo","mean_volume") in vd:
+        m["tilt"]=vd[("hi","mean_volume")]-vd[("lo","mean_volume")]
+    m["clipped"]=int(vd.get(("full","histogram_0db"),0))
+    m["samples"]=int(vd.get(("full","n_samples"),0))
+    return m
+
+def autotune_score(m:dict, target_lufs:float)->float:
+    """Düşük skor daha iyi; ağırlıklar AUTOTUNE_WEIGHTS'te."""
+    w=AUTOTUNE_WEIGHTS
+    if "I" not in m: return float("inf")
+    s =w["loudness"]*abs(m["I"]-target_lufs)
+    s+=w["true_peak"]*max(0.0, m.get("tp",0.0)-AUTOTUNE_MAX_TP)
+    s+=w["noise"]*max(0.0, m.get("noise",target_lufs)-(target_lufs-45.0))
+    s+=w["tilt"]*abs(m.get("tilt",AUTOTUNE_TILT_REF)-AUTOTUNE_TILT_REF)
+    if m.get("samples"): s+=w["clip"]*min(10.0, 1000.0*m["clipped"]/m["samples"])
+    return s
+
+def autotune_render(chain:str, excerpt:str, out_wav:str, target_lufs:float, timeout:int=120, token:CancelToken|None=None)->dict:
+    """Tek aday: zinciri alıntıya uygular, önizlenebilir WAV yazar ve aynı geçişte ölçer."""
+    pre=(chain+",") if chain else ""
+    fc=(f"[0:a]{pre}aresample=48000,asplit=4[o][e0][l0][h0];"
+        "[e0]ebur128=peak=true:framelog=info,volumedetect@full[e];"
+        "[l0]lowpass=f=400,volumedetect@lo[l];[h0]highpass=f=4000,volumedetect@hi[h]")
+    cmd=["ffmpeg","-hide_banner","-nostats","-y","-threads","1","-filter_complex_threads","1","-i",excerpt,
+         "-filter_complex",fc,"-map","[o]","-c:a","pcm_s16le",out_wav,
+         "-map","[e]","-f","null","-","-map","[l]","-f","null","-","-map","[h]","-f","null","-"]
+    ok,log=run_capture(cmd, timeout, token)
+    if not ok: return {"ok":False, "error":log[-600:]}
+    m=_autotune_parse(log)
+    return {"ok":"I" in m, "metrics":m, "score":autotune_score(m, target_lufs)}
+
+def strip_loudnorm_measurements(chain:str, target_lufs:float)->str:
+    """Alıntıda ölçülmüş measured_* değerli loudnorm'u tek geçişli loudnorm'a çevirir (tam dosyaya taşınamaz)."""
+    return ",".join(f"loudnorm=I={target_lufs}:TP=-1.0:LRA=11.0" if p.startswith("loudnorm=") and "measured_" in p else p
+                    for p in chain.split(","))
+
+class AutoTuneWorker(QtCore.QThread):
+    """Aday zincirleri ortak alıntı üzerinde eşzamanlı render edip puanlar; en iyi N'i döner."""
+    done = Signal(bool, str, list)
+    progress = Signal(int, str)
+    def __init__(self, input_path:str, target_lufs:float=-18.0, rnn_model:str|None=None, leveler:bool=True,
+                 extra_chains:list|None=None, seconds:int=AUTOTUNE_EXCERPT_SECONDS, top_n:int=AUTOTUNE_TOP_N, parent=None):
+        super().__init__(parent)
+        self.input_path=input_path; self.target_lufs=target_lufs; self.rnn_model=rnn_model
+        self.leveler=leveler; self.extra_chains=extra_chains or []; self.seconds=seconds; self.top_n=top_n
+        self.token=CancelToken(); self.work_dir=None
+
+    def cancel(self): self.token.cancel()
+
+    def run(self):
+        try:
+            ok,msg,res=self.process()
+            self.progress.emit(100, "Hazır")
+            self.done.emit(ok,msg,res)
+        except Exception as e:
+            self.done.emit(False, str(e), [])
+
+    def process(self):
+        """Başarısızlıkta çalışma klasörü silinir; başarıda en iyi N WAV için çağıran sahiplenir (work_dir)."""
+        self.work_dir=tempfile.mkdtemp(prefix="nxa_tune_"); ok=False
+        try:
+            ok,msg,res=self._process(self.work_dir)
+            return ok,msg,res
+        finally:
+            if not ok: shutil.rmtree(self.work_dir, ignore_errors=True)
+
+    def _process(self, work:str):
+        excerpt=os.path.join(work,"excerpt.wav")
+        self.progress.emit(5, "Alıntı çözülüyor")
+        ok,log,start=autotune_excerpt(self.input_path, self.seconds, excerpt, self.token)
+        if not ok: return False, "Alıntı çıkarılamadı:\n\n"+log[-1200:], []
+
+        self.progress.emit(12, "Analiz")
+        base=dict(target_lufs=self.target_lufs, rnn_model=self.rnn_model, leveler=self.leveler)
+        analyzer=AIStudioWorker(excerpt, **base); analyzer.token=self.token
+        an=analyzer.analyze()
+        jobs=[]; seen=set()
+        for label,chain in self.extra_chains:
+            if chain and chain not in seen: seen.add(chain); jobs.append({"label":label, "params":{}, "chain":chain})
+        for p in autotune_candidates(arnndn_available(self.rnn_model)):
+            chain=AIStudioWorker(excerpt, **base, **p).build_chain(an)
+            if chain in seen: continue
+            seen.add(chain); jobs.append({"label":autotune_label(p), "params":p, "chain":chain})
+        if self.token.cancelled: return False, "İptal edildi.", []
+
+        results=[]; total=len(jobs)
+        with ThreadPoolExecutor(max_workers=min(SUPERVISOR.max_procs, SUPERVISOR.cpu_threads)) as ex:
+            futs={}
+            for i,j in enumerate(jobs):
+                j["wav"]=os.path.join(work, f"cand_{i:02d}.wav")
+                futs[ex.submit(autotune_render, j["chain"], excerpt, j["wav"], self.target_lufs, 120, self.token)]=j
+            for n,f in enumerate(as_completed(futs), 1):
+                if self.token.cancelled:
+                    ex.shutdown(wait=False, cancel_futures=True); return False, "İptal edildi.", []
+                r=f.result(); j=futs[f]
+                if r.get("ok"): j.update(metrics=r["metrics"], score=r["score"]); results.append(j)
+                self.progress.emit(int(15+80*n/total), f"Aday {n}/{total}")
+
+        results.sort(key=lambda r: r["score"])
+        top=results[:self.top_n]
+        for r in results[self.top_n:]:
+            try: os.remove(r["wav"])
+            except OSError: pass
+        if not top: return False, "Hiçbir aday zincir çalıştırılamadı.", []
+        return True, f"Auto-Tune: {total} aday, {start:.0f}. sn'den {self.seconds} sn alıntı", top
+
+# ---------------- İzleme klasörü (headless) --------------
+MEDIA_EXTS = (".mp4",".mov",".mkv",".m4v",".avi",".webm")
+
+def file_fingerprint(path:str, block:int=1<<20)->str:
+    h=hashlib.sha1()
+    with open(path,"rb") as f:
+        for chunk in iter(lambda: f.read(block), b""): h.update(chunk)
+    return h.hexdigest()
+
+def log_line(msg:str):
+    print(time.strftime("%Y-%m-%d %H:%M:%S"), msg, flush=True)
+
+class WatchState:
+    """Kalıcı durum (sqlite): dosya satırları + işlenmiş girdi/çıktı parmak izleri."""
+    def __init__(self, db_path:str):
+        self._lock=threading.Lock()
+        self._db=sqlite3.connect(db_path, check_same_thread=False)
+        with self._lock, self._db:
+            self._db.execute("CREATE TABLE IF NOT EXISTS files(path TEXT PRIMARY KEY, size INTEGER, mtime REAL, "
+                             "fp TEXT, status TEXT, out TEXT, error TEXT, updated REAL)")
+            self._db.execute("CREATE TABLE IF NOT EXISTS fingerprints(fp TEXT PRIMARY KEY, kind TEXT, path TEXT)")
+            # önceki oturumda yarıda kalanlar tekrar kuyruğa
+            self._db.execute("UPDATE files SET status='pending' WHERE status='running'")
+
+    def get(self, path:str):
+        with self._lock:
+            r=self._db.execute("SELECT size,mtime,fp,status FROM files WHERE path=?", (path,)).fetchone()
+        return dict(zip(("size","mtime","fp","status"), r)) if r else None
+
+    def set_status(self, path:str, status:str, **kw):
+        cols={"status":status, "updated":time.time(), **kw}
+        with self._lock, self._db:
+            self._db.execute(f"UPDATE files SET {','.join(k+'=?' for k in cols)} WHERE path=?", (*cols.values(), path))
+
+    def register(self, path:str, size:int, mtime:float, fp:str)->str:
+        """Yeni/değişmiş dosyayı kaydeder; aynı içerik daha önce görüldüyse 'duplicate' döner."""
+        with self._lock, self._db:
+            dup=self._db.execute("SELECT kind,path FROM fingerprints WHERE fp=?", (fp,)).fetchone()
+            if dup and dup[1]==path:            # sadece dokunulmuş (touch) dosya: mevcut durum korunur
+                self._db.execute("UPDATE files SET size=?,mtime=?,updated=? WHERE path=?", (size,mtime,time.time(),path))
+                return self._db.execute("SELECT status FROM files WHERE path=?", (path,)).fetchone()[0]
+            status="duplicate" if dup else "pending"
+            self._db.execute("INSERT OR REPLACE INTO files(path,size,mtime,fp,status,out,error,updated) "
+                             "VALUES(?,?,?,?,?,?,?,?)", (path,size,mtime,fp,status,dup[1] if dup else None,None,time.time()))
+            if status=="pending":
+                self._db.execute("INSERT OR REPLACE INTO fingerprints(fp,kind,path) VALUES(?,?,?)", (fp,"input",path))
+        return status
+
+    def add_output(self, fp:str, path:str):
+        with self._lock, self._db:
+            self._db.execute("INSERT OR REPLACE INTO fingerprints(fp,kind,path) VALUES(?,?,?)", (fp,"output",path))
+
+    def forget(self, fp:str, path:str):
+        """Başarısız girdinin izini siler; aynı dosya yeniden bırakılırsa tekrar denenir.
+        Bu girdinin kopyası olarak atlanmış ilk dosya işi devralır, diğer kopyalar ona bağlanır."""
+        with self._lock, self._db:
+            self._db.execute("DELETE FROM fingerprints WHERE fp=? AND kind='input'", (fp,))
+            heir=self._db.execute("SELECT path FROM files WHERE status='duplicate' AND out=? AND fp=? ORDER BY updated LIMIT 1",
+                                  (path,fp)).fetchone()
+            if not heir: return
+            self._db.execute("UPDATE files SET status='pending', out=NULL, updated=? WHERE path=?", (time.time(), heir[0]))
+            self._db.execute("UPDATE files SET out=? WHERE status='duplicate' AND out=?", (heir[0], path))
+            self._db.execute("INSERT OR REPLACE INTO fingerprints(fp,kind,path) VALUES(?,?,?)", (fp,"input",heir[0]))
+
+    def pending(self)->list:
+        with self._lock:
+            return [r[0] for r in self._db.execute("SELECT path FROM files WHERE status='pending' ORDER BY updated")]
+
+    def claim_output(self, path:str, candidates)->str:
+        """Girdiye, başka bir girdinin sahiplenmediği ilk çıktı yolunu ayırır (a.mp4/a.avi → ayrı çıktılar).
+        Yarıda kalmış işte önceki ayrılan yol korunur."""
+        with self._lock, self._db:
+            own=self._db.execute("SELECT out FROM files WHERE path=? AND status!='duplicate'", (path,)).fetchone()
+            for op in itertools.chain([own[0]] if own and own[0] else [], candidates):
+                taken=self._db.execute("SELECT 1 FROM files WHERE out=? AND path!=? AND status!='duplicate'", (op,path)).fetchone()
+                if not taken:
+                    self._db.execute("UPDATE files SET out=? WHERE path=?", (op,path)); return op
+
+class WatchFolderDaemon:
+    """Klasörü yoklar; boyutu sabitlenen yeni dosyaları parmak iziyle eler ve sınırlı kuyrukta işler."""
+    def __init__(self, in_dir:str, out_dir:str, state_path:str|None=None, jobs:int=2,
+                 interval:float=5.0, stable_seconds:float=10.0, ai_opts:dict|None=None):
+        self.in_dir=os.path.abspath(in_dir); self.out_dir=os.path.abspath(out_dir)
+        os.makedirs(self.out_dir, exist_ok=True)
+        self.state=WatchState(state_path or os.path.join(self.out_dir, ".nxa_watch.sqlite"))
+        self.jobs=max(1,jobs); self.interval=interval; self.stable_seconds=stable_seconds
+        self.ai_opts=ai_opts or {}
+        self._queue=queue.Queue(maxsize=self.jobs*2); self._queued=set(); self._qlock=threading.Lock()
+        self._sizes={}; self._stop=threading.Event(); self._token=CancelToken()
+
+    def _stable(self, path:str, st)->bool:
+        now=time.time(); key=(st.st_size, st.st_mtime)
+        prev=self._sizes.get(path)
+        if not prev or prev[0]!=key:
+            self._sizes[path]=(key, now); return False
+        if now-prev[1] < self.stable_seconds: return False
+        try:
+            with open(path,"rb"): pass          # Windows'ta hâlâ yazılıyorsa açılamaz
+        except OSError:
+            return False
+        return True
+
+    def scan(self):
+        try: names=sorted(os.listdir(self.in_dir))
+        except OSError as e: log_line(f"[watch] klasör okunamadı: {e}"); return
+        for name in names:
+            path=os.path.join(self.in_dir,name)
+            if not name.lower().endswith(MEDIA_EXTS) or ".part." in name: continue
+            try: st=os.stat(path)
+            except OSError: continue
+            row=self.state.get(path)
+            if row and row["size"]==st.st_size and row["mtime"]==st.st_mtime: continue
+            if not self._stable(path, st): continue
+            self._sizes.pop(path, None)
+            status=self.state.register(path, st.st_size, st.st_mtime, file_fingerprint(path))
+            log_line(f"[watch] {name}: {'aynı içerik zaten kayıtlı, atlandı' if status=='duplicate' else 'kuyruğa alındı'}")
+        for path in self.state.pending(): self._enqueue(path)
+
+    def _enqueue(self, path:str):
+        with self._qlock:
+            if path in self._queued: return
+            try: self._queue.put_nowait(path)
+            except queue.Full: return          # kuyruk dolu → bir sonraki taramada tekrar denenir
+            self._queued.add(path)
+
+    def process_one(self, path:str):
+        if not os.path.isfile(path): self.state.set_status(path, "missing"); return
+        op=self.state.claim_output(path, self._output_candidates(path))
+        part=str(Path(op).with_suffix(".part"+Path(op).suffix))
+        log=str(Path(op).with_suffix(""))+"_ffmpeg.log"
+        self.state.set_status(path, "running", out=op)
+        log_line(f"[watch] işleniyor: {os.path.basename(path)}")
+        try:
+            ai=AIStudioWorker(path, **self.ai_opts); ai.token=self._token
+            ok,msg,res=ai.process()
+            af=res.get("studio_chain") or "highpass=f=80,lowpass=f=14000"
+            if ok and ffmpeg_stream(build_export_cmd(path, part, af), log, media_duration(path), token=self._token):
+                os.replace(part, op)
+                self.state.add_output(file_fingerprint(op), op)
+                self.state.set_status(path, "done", out=op, error=None)
+                log_line(f"[watch] tamamlandı: {op}")
+            elif self._stop.is_set():
+                self.state.set_status(path, "pending")
+            else:
+                self.state.set_status(path, "failed", error=f"log: {log}"); self.state.forget(self.state.get(path)["fp"], path)
+                log_line(f"[watch] HATA: {os.path.basename(path)} (log: {log})")
+        finally:
+            if os.path.exists(part):
+                try: os.remove(part)
+                except OSError: pass
+
+    def _output_candidates(self, path:str):
+        name=Path(suggest_output_path(path)).name; p=Path(path); ext=Path(name).suffix
+        yield os.path.join(self.out_dir, name)
+        stem=f"{p.stem}_{p.suffix.lstrip('.').lower()}_cleaned"     # aynı adlı farklı uzantılar çakışmasın
+        yield os.path.join(self.out_dir, stem+ext)
+        for i in itertools.count(2): yield os.path.join(self.out_dir, f"{stem}_{i}{ext}")
+
+    def _worker(self):
+        while not self._stop.is_set():
+            try: path=self._queue.get(timeout=0.5)
+            except queue.Empty: continue
+            try: self.process_one(path)
+            except Exception as e:
+                self.state.set_status(path, "failed", error=str(e)); log_line(f"[watch] HATA: {e}")
+                row=self.state.get(path)
+                if row and row["fp"]: self.state.forget(row["fp"], path)
+            finally:
+                with self._qlock: self._queued.discard(path)
+
+    def run(self):
+        log_line(f"[watch] {self.in_dir} → {self.out_dir} ({self.jobs} eşzamanlı iş)")
+        threads=[threading.Thread(target=self._worker, daemon=True) for _ in range(self.jobs)]
+        for t in threads: t.start()
+        try:
+            while not self._stop.is_set():
+                self.scan(); self._stop.wait(self.interval)
+        except KeyboardInterrupt:
+            log_line("[watch] durduruluyor…")
+        self._stop.set(); self._token.cancel()
+        for t in threads: t.join()
+
+def watch_main(argv:list)->int:
+    ap=argparse.ArgumentParser(prog="main.py watch", description="İzleme klasörü: yeni kayıtları otomatik işler.")
+    ap.add_argument("in_dir"); ap.add_argument("out_dir")
+    ap.add_argument("--state", help="durum veritabanı (varsayılan: <out_dir>/.nxa_watch.sqlite)")
+    ap.add_argument("--jobs", type=int, default=2); ap.add_argument("--interval", type=float, default=5.0)
+    ap.add_argument("--stable", type=float, default=10.0, help="boyutun sabit kalması gereken süre (sn)")
+    ap.add_argument("--style", default="Natural", choices=["Natural","Warm","Crisp","Radio"])
+    ap.add_argument("--lufs", type=float, default=-18.0); ap.add_argument("--rnn-model")
+    ap.add_argument("--no-humanize", action="store_true"); ap.add_argument("--no-leveler", action="store_true")
+    ap.add_argument("--no-nr-aggr", action="store_true"); ap.add_argument("--enhance", action="store_true")
+    ap.add_argument("--max-procs", type=int, help="eşzamanlı ffmpeg süreci üst sınırı (varsayılan: çekirdek sayısı)")
+    ap.add_argument("--cpu-threads", type=int, help="toplam ffmpeg iş parçacığı bütçesi (varsayılan: çekirdek sayısı)")
+    a=ap.parse_args(argv)
+    SUPERVISOR.configure(a.max_procs, a.cpu_threads)
+    if not ff_ok(): print("FFmpeg/FFprobe bulunamadı. PATH'e ekleyin.", file=sys.stderr); return 2
+    ai_opts=dict(target_lufs=a.lufs, rnn_model=a.rnn_model, leveler=not a.no_leveler, nr_aggr=not a.no_nr_aggr,
+                 style=a.style, humanize=not a.no_humanize, enhance_beta=a.enhance)
+    WatchFolderDaemon(a.in_dir, a.out_dir, a.state, a.jobs, a.interval, a.stable, ai_opts).run()
+    return 0
+
+# ------------------ İş sunucusu (headless) ----------------
+JOB_SERVER_PORT      = 8765
+HEARTBEAT_INTERVAL   = 2.0
+HEARTBEAT_TIMEOUT    = 10.0
+JOB_MAX_ATTEMPTS     = 3
+THROUGHPUT_WINDOW    = 300.0
+COMPLETE_RETRY_MAX   = 30.0
+JOB_TOKEN_ENV        = "NXA_JOB_TOKEN"
+
+class JobScheduler:
+    """İş kuyruğu: işler işçilere paylaştırılır (shard), boşta kalan işçi en dolu kuyruktan çalar."""
+    def __init__(self, heartbeat_timeout:float=HEARTBEAT_TIMEOUT, root:str|None=None):
+        self._lock=threading.Lock(); self.heartbeat_timeout=heartbeat_timeout
+        self.root=os.path.realpath(root) if root else None
+        self.jobs={}; self.workers={}; self.unassigned=deque()
+        self._job_ids=itertools.count(1); self._worker_ids=itertools.count(1)
+        self.started=time.time(); self.completed=deque()     # (bitiş, medya sn, süre sn)
+        self.done=0; self.failed=0
+
+    # ---- işler ----
+    def _confine(self, path, what:str)->str:
+        """Yolu mutlaklaştırır; depolama kökü verilmişse dışına çıkmasına izin vermez."""
+        if not isinstance(path, str) or not path: raise ValueError(f"{what} gerekli")
+        rp=os.path.realpath(path)
+        if self.root and os.path.commonpath([rp, self.root])!=self.root:
+            raise ValueError(f"{what} depolama kökü dışında: {path}")
+        return rp
+
+    def submit(self, spec:dict)->dict:
+        ip=self._confine(spec.get("input"), "input")
+        op=self._confine(spec.get("output") or suggest_output_path(ip), "output")
+        model=spec.get("rnn_model") or None
+        if model is not None:
+            model=self._confine(model, "rnn_model")
+            if not os.path.isfile(model): raise ValueError(f"rnn_model bulunamadı: {model}")
+        with self._lock:
+            jid=f"j{next(self._job_ids)}"
+            job={"id":jid, "input":ip, "output":op,
+                 "style":str(spec.get("style","Natural")), "target_lufs":float(spec.get("target_lufs",-18.0)),
+                 "rnn_model":model, "humanize":bool(spec.get("humanize",True)),
+                 "enhance_beta":bool(spec.get("enhance_beta",False)),
+                 "status":"queued", "worker":None, "percent":0, "attempts":0, "error":None,
+                 "created":time.time(), "started":None, "finished":None}
+            self.jobs[jid]=job; self._assign(jid)
+            return dict(job)
+
+    def _load(self, w:dict)->float:
+        return (len(w["queue"])+len(w["running"]))/max(1,w["slots"])
+
+    def _assign(self, jid:str):
+        if not self.workers: self.unassigned.append(jid); return
+        w=min(self.workers.values(), key=self._load); w["queue"].append(jid); self.jobs[jid]["worker"]=w["id"]
+
+    def lease(self, wid:str)->dict|None:
+        with self._lock:
+            w=self.workers.get(wid)
+            if w is None: raise KeyError(wid)
+            w["last_seen"]=time.time()
+            if len(w["running"])>=w["slots"]: return None
+            if w["queue"]: jid=w["queue"].popleft()
+            elif self.unassigned: jid=self.unassigned.popleft()
+            else:
+                victim=max((o for o in self.workers.values() if o is not w and o["queue"]),
+                           key=lambda o: len(o["queue"]), default=None)
+                if victim is None: return None
+                jid=victim["queue"].pop(); w["stolen"]+=1      # kuyruğun sonundan çal
+            job=self.jobs[jid]
+            job.update(status="running", worker=wid, percent=0, started=time.time()); job["attempts"]+=1
+            w["running"].add(jid)
+            return dict(job)
+
+    def complete(self, wid:str, jid:str, ok:bool, error:str|None=None, media_seconds:float=0.0)->bool:
+        with self._lock:
+            job=self.jobs.get(jid); w=self.workers.get(wid)
+            if not job or job["worker"]!=wid or job["status"]!="running": return False   # başka işçiye devredilmiş
+            if w: w["running"].discard(jid); w["last_seen"]=time.time(); w["done" if ok else "failed"]+=1
+            now=time.time()
+            job.update(status="done" if ok else "failed", finished=now, error=None if error is None else str(error), percent=100 if ok else job["percent"])
+            if ok:
+                self.done+=1; self.completed.append((now, media_seconds, now-job["started"]))
+            else: self.failed+=1
+            return True
+
+    # ---- işçiler ----
+    def register(self, name:str, host:str, slots:int)->dict:
+        with self._lock:
+            wid=f"w{next(self._worker_ids)}"
+            self.workers[wid]={"id":wid, "name":name, "host":host, "slots":max(1,int(slots)),
+                               "last_seen":time.time(), "queue":deque(), "running":set(),
+                               "done":0, "failed":0, "stolen":0}
+            while self.unassigned: self._assign(self.unassigned.popleft())
+            return {"id":wid, "heartbeat_interval":HEARTBEAT_INTERVAL}
+
+    def heartbeat(self, wid:str, progress:dict, processes:dict|None=None):
+        with self._lock:
+            w=self.workers.get(wid)
+            if w is None: raise KeyError(wid)
+            w["last_seen"]=time.time()
+            progress=progress or {}
+            if not isinstance(progress, dict) or not all(isinstance(p, dict) for p in progress.values()):
+                raise ValueError("progress bir nesne sözlüğü olmalı")
+            if processes: w["processes"]=processes
+            for jid,p in progress.items():
+                job=self.jobs.get(jid)
+                if job and job["worker"]==wid and job["status"]=="running":
+                    job["percent"]=int(clamp(float(p.get("percent",0)),0,100)); job["elapsed"]=p.get("elapsed")
+            # işçinin artık bildirmediği işler (kayıp kira yanıtı, kayıp sonuç) geri alınır;
+            # yeni kiralanan iş ilk kalp atışına yetişmemiş olabilir, o yüzden zaman aşımı kadar beklenir
+            now=time.time()
+            for jid in [j for j in w["running"] if j not in progress and now-self.jobs[j]["started"]>self.heartbeat_timeout]:
+                w["running"].discard(jid)
+                log_line(f"[server] {jid} işçi {wid} tarafından bildirilmiyor, geri alınıyor")
+                self._requeue(jid, now)
+
+    def _requeue(self, jid:str, now:float):
+        job=self.jobs[jid]
+        if job["status"]=="running" and job["attempts"]>=JOB_MAX_ATTEMPTS:
+            job.update(status="failed", error="işçi yanıt vermedi", finished=now); self.failed+=1; return
+        job.update(status="queued", worker=None, percent=0); self._assign(jid)
+
+    def reap(self):
+        """Kalp atışı kesilen işçinin işlerini kuyruğa geri koyar."""
+        with self._lock:
+            now=time.time()
+            for wid in [k for k,w in self.workers.items() if now-w["last_seen"]>self.heartbeat_timeout]:
+                w=self.workers.pop(wid)
+                log_line(f"[server] işçi düştü: {w['name']} ({wid}), {len(w['running'])} çalışan iş geri alınıyor")
+                for jid in list(w["running"])+list(w["queue"]): self._requeue(jid, now)
+
+    def metrics(self)->dict:
+        with self._lock:
+            now=time.time()
+            while self.completed and now-self.completed[0][0]>THROUGHPUT_WINDOW: self.completed.popleft()
+            span=min(THROUGHPUT_WINDOW, max(1.0, now-self.started))
+            media=sum(c[1] for c in self.completed); busy=sum(c[2] for c in self.completed)
+            queued=len(self.unassigned)+sum(len(w["queue"]) for w in self.workers.values())
+            return {
+                "queue_depth":queued,
+                "running":sum(len(w["running"]) for w in self.workers.values()),
+                "done":self.done, "failed":self.failed,
+                "jobs_per_min":round(60.0*len(self.completed)/span, 2),
+                "media_seconds_per_sec":round(media/span, 2),
+                "realtime_factor":round(media/busy, 2) if busy else None,
+                "workers":[{"id":w["id"], "name":w["name"], "host":w["host"], "slots":w["slots"],
+                            "running":{j:self.jobs[j]["percent"] for j in sorted(w["running"])}, "queued":len(w["queue"]), "done":w["done"],
+                            "failed":w["failed"], "stolen":w["stolen"], "last_seen":round(now-w["last_seen"],1),
+                            "processes":w.get("processes")}
+                           for w in self.workers.values()],
+            }
+
+class _JobHandler(BaseHTTPRequestHandler):
+    scheduler:JobScheduler=None
+    token:str|None=None
+
+    def _authorized(self)->bool:
+        if not self.token: return True
+        got=self.headers.get("Authorization","")
+        if hmac.compare_digest(got.encode("utf-8"), f"Bearer {self.token}".encode("utf-8")): return True
+        self._send(401, {"error":"yetkisiz"}); return False
+
+    def _send(self, code:int, obj=None):
+        body=json.dumps(obj, ensure_ascii=False).encode("utf-8") if obj is not None else b""
+        self.send_response(code); self.send_header("Content-Type","application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body))); self.end_headers(); self.wfile.write(body)
+
+    def _body(self)->dict:
+        n=int(self.headers.get("Content-Length") or 0)
+        data=json.loads(self.rfile.read(n) or b"{}") if n else {}
+        if not isinstance(data, dict): raise ValueError("gövde bir JSON nesnesi olmalı")
+        return data
+
+    def do_GET(self):
+        if not self._authorized(): return
+        sch=self.scheduler; parts=self.path.strip("/").split("/")
+        if parts==["metrics"]: return self._send(200, sch.metrics())
+        # kopyalar kilit altında alınır, yavaş istemciye yazma kilit dışında yapılır
+        if parts==["jobs"]:
+            with sch._lock: jobs=[dict(j) for j in sch.jobs.values()]
+            return self._send(200, jobs)
+        if len(parts)==2 and parts[0]=="jobs":
+            with sch._lock: job=dict(sch.jobs[parts[1]]) if parts[1] in sch.jobs else None
+            return self._send(200, job) if job else self._send(404, {"error":"iş yok"})
+        self._send(404, {"error":"bilinmeyen yol"})
+
+    def do_POST(self):
+        if not self._authorized(): return
+        sch=self.scheduler; parts=self.path.strip("/").split("/")
+        try:
+            data=self._body()
+            if parts==["jobs"]: return self._send(201, sch.submit(data))
+            if parts==["workers"]:
+                return self._send(201, sch.register(data.get("name","worker"), data.get("host",self.client_address[0]), data.get("slots",1)))
+            if len(parts)==3 and parts[0]=="workers" and parts[2]=="heartbeat":
+                sch.heartbeat(parts[1], data.get("progress"), data.get("processes")); return self._send(200, {"ok":True})
+            if len(parts)==3 and parts[0]=="workers" and parts[2]=="lease":
+                job=sch.lease(parts[1]); return self._send(200, job) if job else self._send(204)
+            if len(parts)==3 and parts[0]=="jobs" and parts[2]=="complete":
+                ok=sch.complete(data.get("worker"), parts[1], bool(data.get("ok")), data.get("error"), float(data.get("media_seconds") or 0))
+                return self._send(200 if ok else 409, {"ok":ok})
+        except KeyError:
+            return self._send(404, {"error":"işçi kayıtlı değil"})
+        except (ValueError, TypeError, AttributeError) as e:      # JSONDecodeError ValueError'dır
+            return self._send(400, {"error":str(e)})
+        self._send(404, {"error":"bilinmeyen yol"})
+
+    def log_message(self, fmt, *args): pass
+
+def serve_jobs(host:str="127.0.0.1", port:int=JOB_SERVER_PORT, heartbeat_timeout:float=HEARTBEAT_TIMEOUT,
+               token:str|None=None, root:str|None=None):
+    sch=JobScheduler(heartbeat_timeout, root)
+    handler=type("JobHandler", (_JobHandler,), {"scheduler":sch, "token":token or None})
+    srv=ThreadingHTTPServer((host,port), handler)
+    stop=threading.Event()
+    def reaper():
+        while not stop.wait(1.0): sch.reap()
+    threading.Thread(target=reaper, daemon=True).start()
+    log_line(f"[server] http://{host}:{srv.server_address[1]} dinleniyor")
+    try: srv.serve_forever()
+    except KeyboardInterrupt: log_line("[server] durduruluyor…")
+    finally: stop.set(); srv.server_close()
+
+def _http_json(method:str, url:str, data:dict|None=None, timeout:float=10.0, token:str|None=None):
+    body=json.dumps(data).encode("utf-8") if data is not None else None
+    headers={"Content-Type":"application/json"}
+    if token: headers["Authorization"]=f"Bearer {token}"
+    req=urllib.request.Request(url, data=body, method=method, headers=headers)
+    try:
+        with urllib.request.urlopen(req, timeout=timeout) as r:
+            raw=r.read(); return r.status, (json.loads(raw) if raw else None)
+    except urllib.error.HTTPError as e:
+        raw=e.read(); return e.code, (json.loads(raw) if raw else None)
+
+class JobWorkerNode:
+    """Sunucudan iş kiralar (slot sayısı kadar eşzamanlı), kalp atışıyla ilerleme bildirir."""
+    def __init__(self, server:str, slots:int=1, name:str|None=None, auth:str|None=None):
+        self.server=server.rstrip("/"); self.slots=max(1,slots); self.auth=auth
+        self.name=name or f"{socket.gethostname()}:{os.getpid()}"
+        self.wid=None; self._progress={}; self._plock=threading.Lock(); self._stop=threading.Event(); self._token=CancelToken()
+
+    def _register(self):
+        code,res=_http_json("POST", f"{self.server}/workers", {"name":self.name, "host":socket.gethostname(), "slots":self.slots}, token=self.auth)
+        if code!=201: raise RuntimeError(f"kayıt reddedildi: HTTP {code} {res}")
+        self.wid=res["id"]; log_line(f"[worker] {self.name} kayıt: {self.wid} ({self.slots} slot)")
+
+    def _heartbeat_loop(self):
+        while not self._stop.wait(HEARTBEAT_INTERVAL):
+            with self._plock: prog={k:dict(v) for k,v in self._progress.items()}
+            try:
+                code,_=_http_json("POST", f"{self.server}/workers/{self.wid}/heartbeat", {"progress":prog, "processes":SUPERVISOR.snapshot()}, token=self.auth)
+                if code==404: self._register()          # sunucu bizi düşürmüş → yeniden kayıt
+            except (OSError, RuntimeError) as e:
+                log_line(f"[worker] sunucuya ulaşılamadı: {e}")
+
+    def run_job(self, job:dict)->tuple:
+        ip=job["input"]; op=job["output"]
+        if not os.path.isfile(ip): return False, f"girdi yok: {ip}", 0.0
+        os.makedirs(str(Path(op).parent), exist_ok=True)
+        part=str(Path(op).with_suffix(f".{self.wid}.part{Path(op).suffix}"))
+        log=str(Path(op).with_suffix(""))+"_ffmpeg.log"
+        ai=AIStudioWorker(ip, target_lufs=job["target_lufs"], rnn_model=job.get("rnn_model"),
+                          style=job["style"], humanize=job["humanize"], enhance_beta=job["enhance_beta"])
+        ai.token=self._token
+        try:
+            ok,msg,res=ai.process()
+            af=res.get("studio_chain") or "highpass=f=80,lowpass=f=14000"
+            total=media_duration(ip); t0=time.time()
+            def on_percent(p):
+                with self._plock: self._progress[job["id"]]={"percent":p, "elapsed":round(time.time()-t0,1)}
+            if not (ok and ffmpeg_stream(build_export_cmd(ip, part, af), log, total, on_percent, self._token)):
+                return False, f"ffmpeg başarısız (log: {log})", 0.0
+            os.replace(part, op)
+            return True, None, total
+        finally:
+            if os.path.exists(part):           # ortak depoda yarım dosya bırakma
+                try: os.remove(part)
+                except OSError: pass
+
+    def _report(self, jid:str, wid:str, payload:dict):
+        """Sonucu sunucu kabul edene (ya da reddedene) kadar artan aralıklarla yeniden gönderir."""
+        delay=1.0
+        while True:
+            try:
+                code,_=_http_json("POST", f"{self.server}/jobs/{jid}/complete", dict(payload, worker=wid), token=self.auth)
+                if code<500:
+                    if code!=200: log_line(f"[worker] {jid} sonucu kabul edilmedi: HTTP {code}")
+                    return
+                log_line(f"[worker] {jid} sonuç bildirilemedi: HTTP {code}, {delay:.0f} sn sonra tekrar")
+            except OSError as e:
+                log_line(f"[worker] {jid} sonuç bildirilemedi: {e}, {delay:.0f} sn sonra tekrar")
+            if self._stop.wait(delay): return
+            delay=min(delay*2, COMPLETE_RETRY_MAX)
+
+    def _slot_loop(self):
+        while not self._stop.is_set():
+            wid=self.wid
+            try:
+                code,job=_http_json("POST", f"{self.server}/workers/{wid}/lease", token=self.auth)
+            except OSError:
+                self._stop.wait(HEARTBEAT_INTERVAL); continue
+            if code!=200: self._stop.wait(1.0); continue
+            # sonuç sunucuya ulaşana dek iş kalp atışında bildirilir; aksi hâlde sunucu onu geri alır
+            with self._plock: self._progress[job["id"]]={"percent":0, "elapsed":0.0}
+            log_line(f"[worker] {job['id']} başladı: {job['input']}")
+            try: ok,err,media=self.run_job(job)
+            except Exception as e: ok,err,media=False,str(e),0.0
+            if self._stop.is_set(): return        # kapanışta bildirme; sunucu işi kalp atışı zaman aşımıyla geri alır
+            log_line(f"[worker] {job['id']} {'tamamlandı' if ok else 'HATA: '+str(err)}")
+            self._report(job["id"], wid, {"ok":ok, "error":err, "media_seconds":media})
+            with self._plock: self._progress.pop(job["id"], None)
+
+    def run(self):
+        self._register()
+        threads=[threading.Thread(target=self._heartbeat_loop, daemon=True)]
+        threads+=[threading.Thread(target=self._slot_loop, daemon=True) for _ in range(self.slots)]
+        for t in threads: t.start()
+        try:
+            while not self._stop.wait(0.5): pass
+        except KeyboardInterrupt:
+            log_line("[worker] durduruluyor…"); self._stop.set(); self._token.cancel()
+
+def jobs_main(cmd:str, argv:list)->int:
+    ap=argparse.ArgumentParser(prog=f"main.py {cmd}")
+    if cmd=="serve":
+        ap.add_argument("--host", default="127.0.0.1"); ap.add_argument("--port", type=int, default=JOB_SERVER_PORT)
+        ap.add_argument("--heartbeat-timeout", type=float, default=HEARTBEAT_TIMEOUT)
+        ap.add_argument("--token", default=os.environ.get(JOB_TOKEN_ENV), help=f"paylaşılan erişim anahtarı (varsayılan: ${JOB_TOKEN_ENV})")
+        ap.add_argument("--root", help="input/output/rnn_model yollarının kalması gereken depolama kökü")
+        a=ap.parse_args(argv)
+        if not a.token and a.host not in ("127.0.0.1","localhost","::1"):
+            print(f"{a.host} üzerinde dinlemek için --token (veya ${JOB_TOKEN_ENV}) gerekli.", file=sys.stderr); return 2
+        serve_jobs(a.host, a.port, a.heartbeat_timeout, a.token, a.root); return 0
+    ap.add_argument("server", help="örn. http://127.0.0.1:8765")
+    ap.add_argument("--token", default=os.environ.get(JOB_TOKEN_ENV), help=f"sunucunun erişim anahtarı (varsayılan: ${JOB_TOKEN_ENV})")
+    if cmd=="worker":
+        ap.add_argument("--slots", type=int, default=1); ap.add_argument("--name")
+        ap.add_argument("--max-procs", type=int); ap.add_argument("--cpu-threads", type=int)
+        a=ap.parse_args(argv)
+        SUPERVISOR.configure(a.max_procs, a.cpu_threads)
+        if not ff_ok(): print("FFmpeg/FFprobe bulunamadı. PATH'e ekleyin.", file=sys.stderr); return 2
+        try: JobWorkerNode(a.server, a.slots, a.name, a.token).run()
+        except RuntimeError as e: print(f"HATA: {e}", file=sys.stderr); return 2
+        return 0
+    ap.add_argument("inputs", nargs="+"); ap.add_argument("--output")
+    ap.add_argument("--style", default="Natural", choices=["Natural","Warm","Crisp","Radio"])
+    ap.add_argument("--lufs", type=float, default=-18.0); ap.add_argument("--rnn-model")
+    ap.add_argument("--no-humanize", action="store_true"); ap.add_argument("--enhance", action="store_true")
+    a=ap.parse_args(argv)
+    for ip in a.inputs:
+        code,res=_http_json("POST", a.server.rstrip("/")+"/jobs",
+                            {"input":os.path.abspath(ip), "output":os.path.abspath(a.output) if a.output and len(a.inputs)==1 else None,
+                             "style":a.style, "target_lufs":a.lufs, "rnn_model":os.path.abspath(a.rnn_model) if a.rnn_model else None,
+                             "humanize":not a.no_humanize, "enhance_beta":a.enhance}, token=a.token)
+        print(res.get("id") if code==201 else f"HATA {code}: {res}")
+    return 0
+
 # ----------------- Logo indirme yardımcı -----------------
 def fetch_logo_pixmap(url:str)->QPixmap|None:
     try:
@@ -300,7 +1497,8 @@ class MainWindow(QMainWindow):
         self.resize(1260,940)
         self.preview_mode="orig"; self.preview_sec=PREVIEW_SECONDS_DEFAULT
         self.preview_path=None; self.studio_chain=None
-        self._worker=None; self._ai=None
+        self._worker=None; self._ai=None; self._tune=None; self._tune_results=[]; self._preview=None; self._tune_ai=None
+        self._tune_dir=None; self._tune_base={}; self._tune_applied=-1
 
         # Logo → pencere, görev çubuğu, tepsi
         self.logo_pixmap = fetch_logo_pixmap(LOGO_IMAGE_URL)
@@ -394,9 +1592,13 @@ class MainWindow(QMainWindow):
         self.in_edit=QLineEdit(); self.in_btn=QPushButton("Seç…")
         self.out_edit=QLineEdit(); self.out_btn=QPushButton("Kaydet Yeri…")
         self.ai_studio_btn=QPushButton("AI: Studio/Podcast")
+        self.tune_btn=QPushButton("Auto-Tune"); self.tune_box=QComboBox(); self.tune_box.setEnabled(False)
+        self.tune_box.setPlaceholderText("Auto-Tune önerileri")
         r1.addWidget(QLabel("Girdi:")); r1.addWidget(self.in_edit); r1.addWidget(self.in_btn); r1.addWidget(self.ai_studio_btn)
+        r1.addWidget(self.tune_btn); r1.addWidget(self.tune_box)
         r2=QHBoxLayout(); r2.addWidget(QLabel("Çıktı:")); r2.addWidget(self.out_edit); r2.addWidget(self.out_btn)
         self.in_btn.clicked.connect(self.pick_input); self.out_btn.clicked.connect(self.pick_output); self.ai_studio_btn.clicked.connect(self.run_ai_studio)
+        self.tune_btn.clicked.connect(self.run_auto_tune); self.tune_box.activated.connect(self.apply_tune_preset)
         root.addLayout(r1); root.addLayout(r2)
 
         grp=QGroupBox("Önizleme (Video+Ses)"); gl=QVBoxLayout(grp)
@@ -446,6 +1648,8 @@ class MainWindow(QMainWindow):
         root.addLayout(btm)
         self.cancel_btn.clicked.connect(self.cancel_current); self.export_btn.clicked.connect(self.export)
         self.status_label=QLabel("Hazır"); root.addWidget(self.status_label)
+        self.proc_label=QLabel(""); self.proc_label.setToolTip(f"Süreç logu: {SUPERVISOR_LOG}"); root.addWidget(self.proc_label)
+        self._proc_timer=QtCore.QTimer(self); self._proc_timer.timeout.connect(self.update_proc_stats); self._proc_timer.start(1000)
 
         pal=self.palette()
         pal.setColor(QtGui.QPalette.Window, QtGui.QColor(18,18,28))
@@ -501,13 +1705,18 @@ class MainWindow(QMainWindow):
         self.cb_copy=QCheckBox(); self.cb_copy.setChecked(True)
         self.sb_scale=QSpinBox(); self.sb_scale.setRange(0,3840); self.sb_scale.setValue(0)
         self.sb_fps=QSpinBox(); self.sb_fps.setRange(0,120); self.sb_fps.setValue(0)
+        self.cb_chunked=QCheckBox(); self.cb_chunked.setChecked(True)
         for label,widget in [
             ("Videoyu kopyala (hızlı)",self.cb_copy),
             ("Ölçek genişliği (0=aynı)",self.sb_scale),
             ("FPS (0=aynı)",self.sb_fps),
+            ("Parçalı paralel kodlama",self.cb_chunked),
         ]: f.addRow(label, widget)
         sa.setWidget(inner); v.addWidget(sa); return w
 
+    def video_opts(self)->dict:
+        return {"copy":self.cb_copy.isChecked(), "scale":self.sb_scale.value(), "fps":self.sb_fps.value()}
+
     def _style_eq_profile(self, style:str, human:bool):
         if not has_filter("equalizer"): return []
         if style=="Warm":
@@ -526,7 +1735,7 @@ class MainWindow(QMainWindow):
                 f"lowpass=f={min(14500,self.sb_low.value())}"]
             use_rnn=self.cb_rnn.isChecked(); rnn_model=self.ed_rnnm.text().strip() or None
             if use_rnn and arnndn_available(rnn_model):
-                af.append(f"arnndn=m={rnn_model}" if rnn_model else "arnndn=m=rnnoise")
+                af.append(arnndn_filter(rnn_model))
             else:
                 af.append(f"afftdn=nr=20:nf={self.sb_aff.value()}:nt=w")
             if self.cb_gate.isChecked() and has_filter("agate"):
@@ -549,7 +1758,7 @@ class MainWindow(QMainWindow):
             f"lowpass=f={self.sb_low.value()}"]
         use_rnn=self.cb_rnn.isChecked(); rnn_model=self.ed_rnnm.text().strip() or None
         if use_rnn and arnndn_available(rnn_model):
-            af.append(f"arnndn=m={rnn_model}" if rnn_model else "arnndn=m=rnnoise")
+            af.append(arnndn_filter(rnn_model))
         else:
             af.append(f"afftdn=nr=9:nf={self.sb_aff.value()}")
         if self.cb_gate.isChecked() and has_filter("agate"):
@@ -568,42 +1777,6 @@ class MainWindow(QMainWindow):
         if has_filter("alimiter"): af.append("alimiter=limit=0.93")
         return ",".join([a for a in af if a])
 
-    def _has_audio_filter(self, cmd:list)->bool:
-        return any(a.startswith("-filter:a") or a=="-af" for a in cmd)
-
-    def _inject_filter_before_output(self, cmd:list, af:str)->list:
-        if not af or self._has_audio_filter(cmd): return cmd
-        return cmd[:-1] + ["-filter:a:0", af] + [cmd[-1]]
-
-    def _simplify_on_error(self, af:str, err:str)->str:
-        removes=[]
-        for key in ["arnndn","agate","asoftclip","alimiter","adeclip","equalizer","compand","dynaudnorm","loudnorm"]:
-            if f"filter '{key}'" in err or f"No such filter: '{key}'" in err: removes.append(key)
-        if not removes: return af
-        kept=[]
-        for p in af.split(","):
-            if any(p.strip().startswith(r+"=") or p.strip()==r for r in removes): continue
-            kept.append(p)
-        return ",".join(kept)
-
-    def _ff_try_with_rescue(self, base_cmd:list, af:str, timeout:int):
-        cmd = self._inject_filter_before_output(list(base_cmd), af)
-        ok, out = run_capture(cmd, timeout)
-        if ok: return True, out, af
-        new_af = self._simplify_on_error(af, out)
-        if new_af != af:
-            self.status("Filtrelerin bir kısmı desteklenmiyor → sadeleştiriliyor…")
-            cmd2 = self._inject_filter_before_output(list(base_cmd), new_af)
-            ok2, out2 = run_capture(cmd2, timeout)
-            if ok2: return True, out2, new_af
-            basic=[p for p in af.split(",") if p.startswith("highpass") or p.startswith("lowpass")]
-            if has_filter("alimiter"): basic.append("alimiter=limit=0.93")
-            cmd3 = self._inject_filter_before_output(list(base_cmd), ",".join(basic) if basic else "")
-            ok3, out3 = run_capture(cmd3, timeout)
-            if ok3: return True, out3, ",".join(basic)
-            return False, out3, ",".join(basic)
-        return False, out, af
-
     # --------------- dosya & önizleme ---------------
     def pick_input(self):
         p,_=QFileDialog.getOpenFileName(self,"Video seç","","Video (*.mp4 *.mov *.mkv *.m4v *.avi *.webm);;Tümü (*.*)")
@@ -635,17 +1808,24 @@ class MainWindow(QMainWindow):
         h=hashlib.sha1(sig.encode("utf-8")).hexdigest()[:10]
         out=str(Path(tempfile.gettempdir())/f"nxa_prev_{h}.mp4"); self.preview_path=out
 
-        base=["ffmpeg","-y","-t",str(sec),"-threads","0","-i",ip]
+        base=["ffmpeg","-y","-t",str(sec),"-i",ip]
         if has_stream(ip,"a"):
             base+=["-map","0:a:0?","-c:a:0","aac","-b:a:0","192k","-ac:a:0","1"]
         if has_stream(ip,"v"):
             base+=["-map","0:v:0?","-c:v:0","copy"]
-        base+=["-movflags","+faststart",out]
+        base+=["-movflags","+faststart","-threads","0",out]
+
+        if self._preview and self._preview.isRunning(): self._preview.cancel(); self._preview.wait()
+        self._preview=PreviewClipWorker(base, af, out, max(120, sec*8), self)
+        self._preview.status.connect(self.status)
+        self._preview.finished.connect(self.on_preview_done)
+        self.status("Önizleme klibi hazırlanıyor…"); self._preview.start()
 
-        preview_timeout = max(120, sec*8)
-        ok, outlog, used_af = self._ff_try_with_rescue(base, af, timeout=preview_timeout)
+    def on_preview_done(self, ok:bool, out:str, log:str):
+        if self.sender() is not self._preview: return          # yerine yenisi başlatılmış
         if not ok:
-            QMessageBox.critical(self,"Önizleme","Klip üretilemedi (timeout/filtre):\n\n"+outlog[-1200:])
+            if "[CANCELLED]" not in log:
+                QMessageBox.critical(self,"Önizleme","Klip üretilemedi (timeout/filtre):\n\n"+log[-1200:])
             return
         self.load_media(out)
 
@@ -659,14 +1839,15 @@ class MainWindow(QMainWindow):
         af = (self.studio_chain if (self.studio_mode_cb.isChecked() and self.studio_chain) else self.build_filters())
         if not af and self.always_processed_cb.isChecked(): af="highpass=f=80,lowpass=f=14000"
 
-        base=["ffmpeg","-y","-threads","0","-i",ip]
-        if has_stream(ip,"a"): base+=["-map","0:a:0?","-filter:a:0",af,"-c:a:0","aac","-b:a:0","256k"]
-        base+=["-map","0:v:0?","-c:v:0","copy"]
-        base+=["-movflags","+faststart",op]
-
+        video=self.video_opts()
         total = media_duration(ip)
         log=str(Path(op).with_suffix(""))+"_ffmpeg.log"
-        self._worker=FFmpegStreamWorker(base, log, total, self)
+        if (video_needs_encode(video) and self.cb_chunked.isChecked()
+                and total>=2*CHUNK_MIN_SECONDS and has_stream(ip,"v")):
+            self._worker=ChunkedExportWorker(ip, op, af, video, log, total, parent=self)
+            self._worker.chunk_done.connect(lambda i,n,fps,rt: self.status(f"Parça {i}/{n}: {fps:.1f} fps · {rt:.2f}x gerçek zaman"))
+        else:
+            self._worker=FFmpegStreamWorker(build_export_cmd(ip, op, af, video), log, total, self)
         self._worker.percent.connect(lambda p:(self.progress.setVisible(True), self.progress.setValue(p), self.progress_label.setText(f"İşleniyor… %{p}")))
         self._worker.finished.connect(self.on_export_done)
         self.progress.setVisible(True); self.progress.setRange(0,100); self.progress.setValue(0)
@@ -685,7 +1866,10 @@ class MainWindow(QMainWindow):
 
     def cancel_current(self):
         try:
-            if hasattr(self,"_ai") and self._ai and self._ai.isRunning(): self._ai.terminate()
+            if hasattr(self,"_ai") and self._ai and self._ai.isRunning(): self._ai.cancel()
+            if hasattr(self,"_tune") and self._tune and self._tune.isRunning(): self._tune.cancel()
+            if self._tune_ai and self._tune_ai.isRunning(): self._tune_ai.cancel()
+            if self._preview and self._preview.isRunning(): self._preview.cancel()
             if hasattr(self,"_worker") and self._worker and self._worker.isRunning(): self._worker.cancel()
         except Exception: pass
         self.status("İptal istendi.")
@@ -694,9 +1878,10 @@ class MainWindow(QMainWindow):
         ip=self.in_edit.text().strip()
         if not ip or not os.path.isfile(ip): self.status("Önce giriş videosu seç."); return
         try:
-            subprocess.run(["ffmpeg","-version"], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=True)
+            ok=SUPERVISOR.run(["ffmpeg","-version"], timeout=15)[0].returncode==0
         except Exception:
-            QMessageBox.critical(self,"FFmpeg","FFmpeg bulunamadı."); return
+            ok=False
+        if not ok: QMessageBox.critical(self,"FFmpeg","FFmpeg bulunamadı."); return
         model_path = self.rnn_path.text().strip() or None
         if model_path and not Path(model_path).is_file():
             QMessageBox.warning(self,"RNNoise","Model yolu geçersiz, afftdn kullanılacak."); model_path=None
@@ -722,12 +1907,92 @@ class MainWindow(QMainWindow):
     def on_ai_studio_done(self,ok,msg,res):
         self.ai_studio_btn.setEnabled(True)
         self.progress.setVisible(False); self.progress_label.setText("")
+        if not ok and self._ai and self._ai.token.cancelled:
+            self.status("AI Studio iptal edildi."); return
         if not ok:
             self.status("AI Studio hatası."); QMessageBox.critical(self,"AI Studio",msg); return
         self.studio_chain=res.get("studio_chain")
         self.studio_mode_cb.setChecked(True); self.status(msg)
         QMessageBox.information(self,"AI Studio",msg)
 
+    def run_auto_tune(self):
+        ip=self.in_edit.text().strip()
+        if not ip or not os.path.isfile(ip): self.status("Önce giriş videosu seç."); return
+        if not has_stream(ip,"a"): QMessageBox.warning(self,"Auto-Tune","Girdide ses akışı yok."); return
+        model_path = self.rnn_path.text().strip() or None
+        if model_path and not Path(model_path).is_file(): model_path=None
+
+        self._drop_tune_dir()
+        self._tune_base=dict(input_path=ip, target_lufs=self.db_lufs.value(), rnn_model=model_path,
+                             leveler=self.cb_leveler.isChecked())
+        self.tune_btn.setEnabled(False); self.tune_box.clear(); self.tune_box.setEnabled(False)
+        self.progress.setVisible(True); self.progress.setRange(0,100); self.progress.setValue(0)
+        self.progress_label.setText("Hazırlanıyor")
+        self._tune=AutoTuneWorker(
+            ip, target_lufs=self.db_lufs.value(), rnn_model=model_path,
+            leveler=self.cb_leveler.isChecked(),
+            extra_chains=[("Mevcut ayarlar", self.build_filters())],
+            parent=self
+        )
+        self._tune.progress.connect(lambda p,l:(self.progress.setValue(p), self.progress_label.setText(l)))
+        self._tune.done.connect(self.on_auto_tune_done)
+        self.status("Auto-Tune: adaylar deneniyor…"); self._tune.start()
+
+    @Slot(bool,str,list)
+    def on_auto_tune_done(self,ok,msg,res):
+        self.tune_btn.setEnabled(True)
+        self.progress.setVisible(False); self.progress_label.setText("")
+        if not ok and self._tune and self._tune.token.cancelled:
+            self.status("Auto-Tune iptal edildi."); return
+        if not ok:
+            self.status("Auto-Tune başarısız."); QMessageBox.warning(self,"Auto-Tune",msg); return
+        self._tune_results=res; self._tune_dir=self._tune.work_dir
+        for i,r in enumerate(res): self.tune_box.addItem(f"{i+1}. {r['label']}  (skor {r['score']:.1f})")
+        self.tune_box.setEnabled(True); self.tune_box.setCurrentIndex(0); self.apply_tune_preset(0)
+        self.status(msg)
+
+    def apply_tune_preset(self, idx:int):
+        if not (0 <= idx < len(self._tune_results)): return
+        r=self._tune_results[idx]; p=r["params"]; m=r["metrics"]; self._tune_applied=idx
+        if p:
+            self.style_box.setCurrentText(p["style"]); self.cb_human.setChecked(p["humanize"])
+            self.cb_nr_aggr.setChecked(p["nr_aggr"]); self.cb_enhance.setChecked(p["enhance_beta"])
+        # alıntıdaki loudnorm ölçümü tam dosyaya uymaz → önce tek geçişe çevir, sonra tam girdiyle yeniden kur
+        self.studio_chain=strip_loudnorm_measurements(r["chain"], self._tune_base.get("target_lufs",self.db_lufs.value()))
+        self.studio_mode_cb.setChecked(True)
+        if p and self._tune_base:
+            # kullanıcının AI Studio çalışmasına (self._ai) dokunulmaz; yeniden kurulum kendi işçisinde
+            if self._tune_ai and self._tune_ai.isRunning(): self._tune_ai.cancel()
+            self._tune_ai=AIStudioWorker(self._tune_base["input_path"], target_lufs=self._tune_base["target_lufs"],
+                                         rnn_model=self._tune_base["rnn_model"], leveler=self._tune_base["leveler"], **p, parent=self)
+            self._tune_ai.done.connect(lambda ok,msg,res,i=idx: self.on_tune_chain_ready(i, ok, res))
+            self._tune_ai.start()
+        if os.path.isfile(r["wav"]): self.load_media(r["wav"])
+        self.status(f"{r['label']}: I {m['I']:.1f} LUFS · TP {m.get('tp',0):.1f} dBTP · "
+                    f"gürültü {m.get('noise',0):.1f} LUFS · eğim {m.get('tilt',0):+.1f} dB · clip {m.get('clipped',0)}")
+
+    def on_tune_chain_ready(self, idx:int, ok:bool, res:dict):
+        if ok and idx==self._tune_applied and res.get("studio_chain"):
+            self.studio_chain=res["studio_chain"]
+            self.status(f"{self._tune_results[idx]['label']}: zincir tam girdi ölçümüyle güncellendi.")
+
+    def _drop_tune_dir(self):
+        if not self._tune_dir: return
+        src=self.player.source().toLocalFile()
+        if src and os.path.abspath(src).startswith(os.path.abspath(self._tune_dir)):
+            self.player.stop(); self.player.setSource(QUrl())
+        shutil.rmtree(self._tune_dir, ignore_errors=True); self._tune_dir=None
+
+    def closeEvent(self, e):
+        if self._preview and self._preview.isRunning(): self._preview.cancel(); self._preview.wait()
+        self._drop_tune_dir(); super().closeEvent(e)
+
+    def update_proc_stats(self):
+        s=SUPERVISOR.snapshot()
+        self.proc_label.setText(
+            f"FFmpeg: {s['heavy']}/{s['max_procs']} aktif · {s['threads_used']}/{s['cpu_threads']} iş parçacığı · "
+            f"{s['ok']} tamam, {s['failed']} hata, {s['cancelled']} iptal · CPU {s['cpu_s']:.0f} sn · tepe RSS {s['peak_rss_mb']:.0f} MB")
+
     # --------------- oynatıcı geri bildirim ---------------
     def on_pos(self,pos_ms):
         dur=self.player.duration() or 1
@@ -744,6 +2009,10 @@ class MainWindow(QMainWindow):
 # ------------------------- main --------------------------
 def main():
     os.environ["AV_LOG_FORCE_NOCOLOR"]="1"
+    if len(sys.argv)>1 and sys.argv[1] in ("watch","serve","worker"):
+        signal.signal(signal.SIGTERM, signal.default_int_handler)   # temiz kapanış → çocuk ffmpeg'ler de sonlanır
+    if len(sys.argv)>1 and sys.argv[1]=="watch": sys.exit(watch_main(sys.argv[2:]))
+    if len(sys.argv)>1 and sys.argv[1] in ("serve","worker","submit"): sys.exit(jobs_main(sys.argv[1], sys.argv[2:]))
     set_windows_app_id("NEXOAUDIO.QtStudioAI")  # görev çubuğu gruplaması+ikon
     app=QApplication(sys.argv); app.setStyle("Fusion")
     win=MainWindow(); win.show(); sys.exit(app.exec())